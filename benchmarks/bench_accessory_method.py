@@ -0,0 +1,105 @@
+"""
+Micro-benchmarks for ``AccessoryMethod``: construction, hashing, log decoding and replay
+throughput.
+
+Usage: ``python benchmarks/bench_accessory_method.py [NUM_METHODS]``
+"""
+
+import random
+import sys
+import time
+
+from ape.utils import ZERO_ADDRESS
+from eth_utils import to_checksum_address
+
+from purse.accessory import AccessoryMethod
+from purse.events import (
+    ACCESSORY_UPDATED_TOPIC,
+    RouteUpdate,
+    decode_route_updates,
+    replay_routes,
+    route_update_columns,
+)
+
+PURSE = "0x1111111111111111111111111111111111111111"
+NUM_ACCESSORIES = 50
+REPEATS = 3
+
+
+def bench(label: str, num: int, fn, *args) -> float:
+    """Best wall-clock time of ``REPEATS`` runs of ``fn(*args)``"""
+    elapsed = float("inf")
+
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    print(f"{label:<32} {elapsed * 1000:>10.1f} ms {num / elapsed / 1e6:>8.2f} M ops/s")
+    return elapsed
+
+
+def main(num_methods: int):
+    rng = random.Random(0)
+    accessories = [
+        to_checksum_address(rng.randbytes(20)) for _ in range(NUM_ACCESSORIES)
+    ]
+    pairs = [(rng.randbytes(4), rng.choice(accessories)) for _ in range(num_methods)]
+    signatures = [f"method{idx}(uint256)" for idx in range(num_methods)]
+    hex_ids = ["0x" + method.hex() for method, _ in pairs]
+    methods = [AccessoryMethod(method, accessory) for method, accessory in pairs]
+    updates = [
+        RouteUpdate(
+            PURSE,
+            method,
+            ZERO_ADDRESS,
+            ZERO_ADDRESS if rng.random() < 0.25 else accessory,
+            idx // 10,
+            idx % 10,
+        )
+        for idx, (method, accessory) in enumerate(pairs)
+    ]
+    # NOTE: As returned by `eth_getLogs`
+    raw_logs = [
+        dict(
+            address=update.purse,
+            topics=[
+                "0x" + ACCESSORY_UPDATED_TOPIC.hex(),
+                "0x" + update.method.hex().ljust(64, "0"),
+                "0x" + update.old_accessory[2:].lower().rjust(64, "0"),
+                "0x" + update.new_accessory[2:].lower().rjust(64, "0"),
+            ],
+            data="0x",
+            blockNumber=hex(update.block_number),
+            logIndex=hex(update.log_index),
+        )
+        for update in updates
+    ]
+    print(f"{num_methods} methods ({NUM_ACCESSORIES} accessories)")
+
+    bench(
+        "AccessoryMethod(...)",
+        num_methods,
+        lambda: [AccessoryMethod(m, a) for m, a in pairs],
+    )
+    bench(
+        "AccessoryMethod.parse(hex)",
+        num_methods,
+        lambda: [AccessoryMethod.parse(m, ZERO_ADDRESS) for m in hex_ids],
+    )
+    bench(
+        "AccessoryMethod.parse(signature)",
+        num_methods,
+        lambda: [AccessoryMethod.parse(s, ZERO_ADDRESS) for s in signatures],
+    )
+    bench("hash(AccessoryMethod)", num_methods, lambda: [hash(m) for m in methods])
+    bench("set(AccessoryMethod)", num_methods, set, methods)
+    bench(".model_dump()", num_methods, lambda: [m.model_dump() for m in methods])
+    scalar = bench("decode_route_updates", num_methods, decode_route_updates, raw_logs)
+    columns = bench("route_update_columns", num_methods, route_update_columns, raw_logs)
+    print(f"{'  columns vs. scalar':<32} {scalar / columns:>10.2f} x")
+    bench("replay_routes", num_methods, replay_routes, updates)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,261 @@
+"""
+Gas and wall-clock cost of Purse operations across batch and calldata sizes, compared
+against the baselines in ``benchmarks/baselines.json``.
+
+Measures the overhead of routing through ``Purse.__default__`` (vs. calling an accessory
+directly), the per-entry cost of ``update_accessories``, and the scaling of
+``Multicall.execute``, ``Create.create`` and ``Sponsor.sponsor``.
+
+Usage: ``python benchmarks/bench_gas.py [--network ethereum:local] [--record]``
+(run from the project root, exits non-zero if any result regresses past its threshold)
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from itertools import cycle
+from pathlib import Path
+from typing import Callable
+
+from ape import accounts, compilers, networks, project
+from ape.logging import logger
+from ape.utils import ZERO_ADDRESS
+
+from purse import Accessory, Purse
+from purse.accessory import AccessoryMethod
+
+BASELINES = Path(__file__).parent / "baselines.json"
+# NOTE: Maximum relative increase over baseline before a result counts as a regression
+THRESHOLDS = {"gas": 0.01, "seconds": 1.0}
+REPEATS = 5
+
+CALLDATA_SIZES = [0, 256, 1024, 8192]
+UPDATE_BATCH_SIZES = [1, 10, 50, 100]
+MULTICALL_BATCH_SIZES = [1, 10, 50, 100]
+MULTICALL_DATA_SIZES = [0, 256, 2048]
+SPONSOR_DATA_SIZES = [0, 256, 2048]
+
+ECHO_SRC = """# pragma version 0.4.1
+@external
+def echo(data: Bytes[16384]) -> Bytes[16384]:
+    return data
+"""
+
+# NOTE: Measures the gas used by executing a call, which (unlike the gas used by a
+#       transaction) does not include intrinsic gas or the EIP-7623 calldata floor
+METER_SRC = """# pragma version 0.4.1
+@external
+def execution_gas(target: address, data: Bytes[16500]) -> uint256:
+    start: uint256 = msg.gas
+    response: Bytes[16500] = raw_call(target, data, max_outsize=16500)
+    return start - msg.gas
+"""
+
+
+def measure(fn: Callable, *args, **kwargs) -> dict:
+    """Best gas and wall-clock time of sending the transaction ``fn(*args, **kwargs)``"""
+    results = []
+
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        receipt = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        results.append((receipt.gas_used, elapsed))
+
+    return dict(
+        gas=min(gas for gas, _ in results),
+        seconds=round(min(seconds for _, seconds in results), 4),
+    )
+
+
+def bench_default(purse: Purse, echo, meter, owner, relayer) -> dict[str, dict]:
+    results = {}
+
+    for size in CALLDATA_SIZES:
+        data = random.randbytes(size)
+        results[f"default.routed[{size}]"] = measure(purse.echo, data, sender=owner)
+        results[f"default.direct[{size}]"] = measure(echo.echo, data, sender=owner)
+
+        # NOTE: For larger calldata, the EIP-7623 calldata floor price can exceed the gas
+        #       used by execution, so comparing gas used by both transactions would hide
+        #       the routing overhead entirely. Wall-clock difference is mostly noise, so
+        #       only gas is tracked.
+        calldata = echo.echo.encode_input(data)
+        results[f"default.overhead[{size}]"] = dict(
+            gas=meter.execution_gas.call(purse.address, calldata, sender=relayer)
+            - meter.execution_gas.call(echo.address, calldata, sender=relayer)
+        )
+
+    return results
+
+
+def bench_update_accessories(purse: Purse, echo, multicall) -> dict[str, dict]:
+    results = {}
+
+    for size in UPDATE_BATCH_SIZES:
+        # NOTE: Fresh method IDs every time, so every entry writes a new slot
+        results[f"update_accessories.new[{size}]"] = measure(
+            lambda: purse.update(
+                [
+                    AccessoryMethod(random.randbytes(4), echo.address)
+                    for _ in range(size)
+                ]
+            )[0]
+        )
+
+        methods = [random.randbytes(4) for _ in range(size)]
+        purse.update([AccessoryMethod(method, echo.address) for method in methods])
+        targets = cycle([multicall.address, echo.address])
+
+        def overwrite():
+            target = next(targets)
+            return purse.update([AccessoryMethod(m, target) for m in methods])[0]
+
+        results[f"update_accessories.overwrite[{size}]"] = measure(overwrite)
+
+        purse.update([AccessoryMethod(method, ZERO_ADDRESS) for method in methods])
+
+    return results
+
+
+def bench_multicall(purse: Purse, owner, target) -> dict[str, dict]:
+    results = {}
+
+    for size in MULTICALL_BATCH_SIZES:
+        for data_size in MULTICALL_DATA_SIZES:
+            calls = [
+                dict(target=target, value=0, data=random.randbytes(data_size))
+                for _ in range(size)
+            ]
+            results[f"multicall.execute[{size}x{data_size}]"] = measure(
+                purse.execute, calls, sender=owner
+            )
+
+    return results
+
+
+def bench_create(purse: Purse, owner) -> dict[str, dict]:
+    container = project.Multicall  # NOTE: Just a small contract to deploy
+    initcode = container.contract_type.get_deployment_bytecode()
+    blueprint = owner.declare(container).contract_address
+    salts = iter(random.randbytes(32) for _ in range(2 * REPEATS))
+
+    return {
+        "create.raw": measure(purse.create, initcode, sender=owner),
+        "create.raw_salted": measure(
+            lambda: purse.create(initcode, ZERO_ADDRESS, next(salts), sender=owner)
+        ),
+        "create.blueprint": measure(purse.create, b"", blueprint, sender=owner),
+        "create.blueprint_salted": measure(
+            lambda: purse.create(b"", blueprint, next(salts), sender=owner)
+        ),
+    }
+
+
+def bench_sponsor(purse: Purse, owner, relayer, target) -> dict[str, dict]:
+    results = {}
+    signer = purse.sponsor_signer(signer=owner)
+
+    def sponsor(data: bytes):
+        call = signer.sign(target, data=data, deadline=2**64)
+        return purse.sponsor(*call.args, sender=relayer)
+
+    for size in SPONSOR_DATA_SIZES:
+        results[f"sponsor.sponsor[{size}]"] = measure(sponsor, random.randbytes(size))
+
+    return results
+
+
+def compare(results: dict, baselines: dict, network: str) -> list[str]:
+    regressions = []
+    # NOTE: Wall-clock time is only comparable on the network the baseline was taken on
+    metrics = ["gas", "seconds"] if baselines.get("network") == network else ["gas"]
+
+    for name, result in results.items():
+        if not (baseline := baselines.get("results", {}).get(name)):
+            continue
+
+        for metric in metrics:
+            if metric not in result:
+                continue
+
+            limit = baseline[metric] * (1 + baselines["thresholds"][metric])
+            if result[metric] > max(limit, baseline[metric]):
+                regressions.append(
+                    f"{name}: {metric} {result[metric]:.6g} > {limit:.6g}"
+                    f" (baseline {baseline[metric]:.6g})"
+                )
+
+    return regressions
+
+
+def main(network: str, record: bool) -> int:
+    random.seed(0)
+    logger.set_level("ERROR")
+
+    with networks.parse_network_choice(network) as provider:
+        owner, relayer, target = accounts.test_accounts[:3]
+        singleton = owner.deploy(project.Purse)
+        echo = Accessory(
+            compilers.compile_source("vyper", ECHO_SRC, contractName="Echo").deploy(
+                sender=owner
+            )
+        )
+        multicall = Accessory(owner.deploy(project.Multicall))
+        create = Accessory(owner.deploy(project.Create))
+        sponsor = Accessory(owner.deploy(project.Sponsor))
+        purse = Purse.initialize(
+            owner, echo, multicall, create, sponsor, singleton=singleton
+        )
+        # NOTE: Deployed by another account, so the addresses used above don't change
+        meter = compilers.compile_source(
+            "vyper", METER_SRC, contractName="Meter"
+        ).deploy(sender=relayer)
+
+        results = {
+            **bench_default(purse, echo.contract, meter, owner, relayer),
+            **bench_update_accessories(purse, echo, multicall),
+            **bench_multicall(purse, owner, target),
+            **bench_create(purse, owner),
+            **bench_sponsor(purse, owner, relayer, target),
+        }
+        network_choice = provider.network_choice
+
+    for name, result in results.items():
+        seconds = f"{result['seconds'] * 1000:>10.1f} ms" if "seconds" in result else ""
+        print(f"{name:<36} {result['gas']:>10} gas {seconds}")
+
+    if record:
+        BASELINES.write_text(
+            json.dumps(
+                dict(network=network_choice, thresholds=THRESHOLDS, results=results),
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Recorded baselines to {BASELINES}")
+        return 0
+
+    if not BASELINES.exists():
+        print(f"No baselines found at {BASELINES}, use `--record` to create them")
+        return 0
+
+    regressions = compare(results, json.loads(BASELINES.read_text()), network_choice)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+
+    return int(len(regressions) > 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--network", default="ethereum:local")
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help=f"Overwrite the baselines in {BASELINES.name} with these results",
+    )
+    args = parser.parse_args()
+    sys.exit(main(args.network, args.record))
@@ -0,0 +1,44 @@
+"""
+Import-time budget for the ``purse`` package and CLI, measured with ``python -X importtime``.
+
+Usage: ``python benchmarks/bench_import.py`` (exits non-zero if any budget is exceeded)
+"""
+
+import subprocess
+import sys
+
+# Module => cumulative import time budget (in ms)
+BUDGETS = {
+    "purse": 50,
+    "purse.package": 50,
+    "purse.__main__": 150,
+}
+RUNS = 5
+
+
+def import_time_ms(module: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # NOTE: Last line is the top-level module, "import time: self | cumulative | name"
+    cumulative_us = result.stderr.strip().splitlines()[-1].split("|")[1]
+    return int(cumulative_us) / 1000
+
+
+def main() -> int:
+    over_budget = 0
+
+    for module, budget in BUDGETS.items():
+        elapsed = min(import_time_ms(module) for _ in range(RUNS))
+        status = "ok" if elapsed <= budget else "OVER BUDGET"
+        over_budget += elapsed > budget
+        print(f"{module:<16} {elapsed:>8.1f} ms (budget {budget} ms) {status}")
+
+    return int(over_budget > 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Replay throughput of ``Purse._update_cache_from_logs`` for a long history of accessory churn.
+
+Usage: ``python benchmarks/bench_replay.py [NUM_LOGS]``
+"""
+
+import random
+import sys
+import time
+
+from ape.types import ContractLog
+from ape.utils import ZERO_ADDRESS
+from eth_utils import to_checksum_address
+
+from purse import Purse
+from purse.events import RouteUpdate, replay_routes
+
+PURSE = "0x1111111111111111111111111111111111111111"
+NUM_ACCESSORIES = 50
+NUM_METHODS = 200
+
+
+def make_logs(num_logs: int) -> list[ContractLog]:
+    rng = random.Random(0)
+    accessories = [
+        to_checksum_address(rng.randbytes(20)) for _ in range(NUM_ACCESSORIES)
+    ]
+    methods = [rng.randbytes(4) for _ in range(NUM_METHODS)]
+    routes: dict[bytes, str] = {}
+    logs = []
+
+    for idx in range(num_logs):
+        method = rng.choice(methods)
+        # NOTE: Roughly 1 in 4 updates removes a method
+        new = ZERO_ADDRESS if rng.random() < 0.25 else rng.choice(accessories)
+        old = routes.get(method, ZERO_ADDRESS)
+        routes[method] = new
+        logs.append(
+            ContractLog(
+                event_name="AccessoryUpdated",
+                contract_address=PURSE,
+                event_arguments=dict(
+                    method=method, old_accessory=old, new_accessory=new
+                ),
+                transaction_hash=idx.to_bytes(32, "big"),
+                block_number=idx // 10,
+                block_hash=(idx // 10).to_bytes(32, "big"),
+                log_index=idx % 10,
+                transaction_index=0,
+            )
+        )
+
+    return logs
+
+
+def bench(label: str, fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed * 1000:>10.1f} ms")
+
+
+def main(num_logs: int):
+    logs = make_logs(num_logs)
+    updates = [RouteUpdate.from_log(log) for log in logs]
+    print(
+        f"Replaying {num_logs} logs ({NUM_ACCESSORIES} accessories, {NUM_METHODS} methods)"
+    )
+
+    bench("RouteUpdate.from_log", lambda: [RouteUpdate.from_log(log) for log in logs])
+    bench("replay_routes", replay_routes, updates)
+    bench("Purse._update_cache_from_logs", Purse(PURSE)._update_cache_from_logs, *logs)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
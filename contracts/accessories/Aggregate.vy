@@ -0,0 +1,49 @@
+# pragma version 0.4.3
+# pragma nonreentrancy on
+
+# NOTE: Results are returned through `Purse.__default__` (at most 65535 bytes), which
+#       bounds the returndata kept for every call
+MAX_CALLS: constant(uint256) = 100
+MAX_RETURN_SIZE: constant(uint256) = 512
+
+struct Call:
+    target: address
+    value: uint256
+    allow_failure: bool
+    data: Bytes[2048]
+
+struct Result:
+    success: bool
+    return_data: Bytes[MAX_RETURN_SIZE]
+
+
+@external
+def aggregate(calls: DynArray[Call, MAX_CALLS]) -> DynArray[Result, MAX_CALLS]:
+    """
+    @notice Make calls to multiple targets at once, returning the result of each call
+    @dev Can also be used via `eth_call` from the Purse to batch reads
+    @param calls Array of calls to make, reverting if any call fails unless it allows failure
+    @return Array of `(success, return_data)` for each call (`return_data` is truncated)
+    """
+    # NOTE: Can only work in a EIP-7702 context from Purse
+    assert tx.origin == self, "Aggregate:!authorized"
+
+    results: DynArray[Result, MAX_CALLS] = []
+    for call: Call in calls:
+        success: bool = False
+        return_data: Bytes[MAX_RETURN_SIZE] = b""
+        success, return_data = raw_call(
+            call.target,
+            call.data,
+            max_outsize=MAX_RETURN_SIZE,
+            value=call.value,
+            revert_on_failure=False,
+        )
+
+        if not success and not call.allow_failure:
+            # NOTE: Bubble up the (truncated) revert reason
+            raw_revert(return_data)
+
+        results.append(Result(success=success, return_data=return_data))
+
+    return results
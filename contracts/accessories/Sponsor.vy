@@ -5,6 +5,16 @@ from snekmate.utils import eip712_domain_separator
 initializes: eip712_domain_separator
 
 SPONSOR_TYPEHASH: constant(bytes32) = keccak256("Sponsor(address target,bytes data,uint256 amount,uint256 deadline,uint256 nonce)")
+SPONSOR_BATCH_TYPEHASH: constant(bytes32) = keccak256("SponsorBatch(Call[] calls,uint256 deadline,uint256 nonce)Call(address target,bytes data,uint256 amount)")
+CALL_TYPEHASH: constant(bytes32) = keccak256("Call(address target,bytes data,uint256 amount)")
+
+# NOTE: Kept small, since memory is allocated for the largest possible batch
+MAX_BATCH_SIZE: constant(uint256) = 32
+
+struct Call:
+    target: address
+    data: Bytes[2048]
+    amount: uint256
 
 # @custom:storage-location erc7201:purse.accessories.sponsor.sponsor_nonce
 # keccak256(abi.encode(uint256(keccak256("purse.accessories.sponsor.sponsor_nonce")) - 1)) & ~bytes32(uint256(0xff))
@@ -57,3 +67,50 @@ def sponsor(
 
     self.sponsor_nonce = nonce + 1
     raw_call(target, data, value=amount)
+
+
+@external
+def sponsor_batch(
+    calls: DynArray[Call, MAX_BATCH_SIZE],
+    deadline: uint256,
+    v: uint8,
+    r: bytes32,
+    s: bytes32
+):  # 0xfd4ed36e
+    """
+    @notice Executes a batch of pre-signed calls on behalf of the Purse, using one signature.
+    @dev This function uses EIP-712 to verify a signature over all the calls, which only
+        uses a single nonce. Reverts if the signature is invalid or expired, or if any of
+        the calls fail.
+    @param calls The calls to make, in order (`target`, `data` and `amount` of each call).
+    @param deadline A timestamp after which the signature is no longer valid.
+    @param v Recovery byte of the signature.
+    @param r Half of the ECDSA signature pair.
+    @param s Half of the ECDSA signature pair.
+    """
+    assert block.timestamp <= deadline, "Sponsor:!expired-signature"
+
+    call_hashes: DynArray[bytes32, MAX_BATCH_SIZE] = []
+    for call: Call in calls:
+        call_hashes.append(
+            keccak256(abi_encode(CALL_TYPEHASH, call.target, keccak256(call.data), call.amount))
+        )
+
+    nonce: uint256 = self.sponsor_nonce
+    digest: bytes32 = eip712_domain_separator._hash_typed_data_v4(
+        keccak256(
+            abi_encode(
+                SPONSOR_BATCH_TYPEHASH,
+                # NOTE: EIP-712 encodes arrays as the hash of their concatenated members,
+                #       which skips the offset and length of the ABI-encoded array
+                keccak256(slice(abi_encode(call_hashes), 64, 32 * len(call_hashes))),
+                deadline,
+                nonce,
+            )
+        )
+    )
+    assert ecrecover(digest, v, r, s) == self, "Sponsor:!unauthorized-signer"
+
+    self.sponsor_nonce = nonce + 1
+    for call: Call in calls:
+        raw_call(call.target, call.data, value=call.amount)
@@ -1,7 +1,31 @@
-from .accessory import Accessory
-from .main import Purse
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .accessory import Accessory
+    from .index import RoutingIndex
+    from .main import Purse
+    from .registry import PurseRegistry
+
+# NOTE: Loaded on first access, so importing `purse` doesn't have to import ape
+_LAZY_IMPORTS = {
+    "Accessory": ".accessory",
+    "Purse": ".main",
+    "PurseRegistry": ".registry",
+    "RoutingIndex": ".index",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if not (module := _LAZY_IMPORTS.get(name)):
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    return getattr(import_module(module, __name__), name)
+
 
 __all__ = [
-    Accessory.__name__,
-    Purse.__name__,
+    "Accessory",
+    "Purse",
+    "PurseRegistry",
+    "RoutingIndex",
 ]
@@ -1,23 +1,28 @@
-from typing import TYPE_CHECKING
-from ape.api.address import Address
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from itertools import islice
+from typing import TYPE_CHECKING, Iterator
 import click
 
+# NOTE: Anything heavier than `ape.cli` is imported when a command executes,
+#       to keep `purse --help` (and shell completion) fast
 from ape.cli import (
-    ApeCliContextObject,
     ConnectedProviderCommand,
     account_option,
     ape_cli_context,
 )
-from ape.contracts import ContractContainer
-from ape.types import AddressType
-from createx import CreateX
-from eth_utils.crypto import keccak
-from purse import Purse, Accessory
 
 from .package import ACCESSORIES, DEPLOYMENTS, MANIFEST
 
 if TYPE_CHECKING:
     from ape.api import AccountAPI
+    from ape.api.address import BaseAddress
+    from ape.cli import ApeCliContextObject
+    from ape.types import AddressType
+
+    from .accessory import Accessory
+    from .delegation import Delegation
 
 
 @click.group()
@@ -25,11 +30,93 @@ def cli():
     """Commands for managing a Purse-enabled wallet"""
 
 
+@cache
+def _known_accessories(singleton: "AddressType") -> dict["AddressType", "Accessory"]:
+    from .accessory import Accessory
+
+    # NOTE: Shared across all accounts delegated to ``singleton`` so methods are loaded once
+    return {
+        address: Accessory(address)
+        for accessory_addresses in ACCESSORIES.get(singleton, {}).values()
+        for address in accessory_addresses
+    }
+
+
+def _audit_account(
+    account: "BaseAddress", delegation: "Delegation | None" = None
+) -> dict:
+    """Collect the Purse delegation and accessory state of ``account`` into a record."""
+    from eth_utils import to_hex
+
+    from .delegation import get_delegations
+    from .storage import get_accessories
+
+    if delegation is None:
+        delegation = get_delegations([account.address])[account.address]
+
+    record: dict = dict(
+        address=account.address,
+        delegate=None,
+        purse=None,
+        latest=False,
+        accessories={},
+        outdated={},
+        missing_methods={},
+    )
+
+    if not (delegate := delegation.delegate):
+        return record
+
+    record["delegate"] = delegate
+
+    if not (singleton := delegation.purse):
+        return record
+
+    record["purse"] = singleton
+    record["latest"] = singleton == list(DEPLOYMENTS.values())[-1]
+
+    if not (known_accessories := _known_accessories(singleton)):
+        return record
+
+    # NOTE: Read every method of every known accessory version straight from storage in
+    #       one round trip, without building (and caching) a contract type per account
+    routes = {
+        method: accessory
+        for (_, method), accessory in get_accessories(
+            (account.address, method.method)
+            for accessory in known_accessories.values()
+            for method in accessory.methods
+        ).items()
+    }
+    installed = set(routes.values())
+
+    for accessory_name, accessory_addresses in ACCESSORIES[singleton].items():
+        for address in accessory_addresses:
+            if address in installed:
+                record["accessories"][accessory_name] = address
+
+                if address != (latest := accessory_addresses[-1]):
+                    record["outdated"][accessory_name] = latest
+
+                if missing := [
+                    to_hex(method.method)
+                    for method in known_accessories[address].methods
+                    if routes[method.method] != address
+                ]:
+                    record["missing_methods"][accessory_name] = missing
+
+                break
+
+    return record
+
+
 @cli.command(cls=ConnectedProviderCommand)
 @ape_cli_context()
 @click.argument("address")
-def check(cli_ctx: ApeCliContextObject, address: str):
+def check(cli_ctx: "ApeCliContextObject", address: str):
     """Check if ADDRESS has Purse delegate enabled, then check version of accessories."""
+    from ape.api.address import Address
+    from ape.types import AddressType
 
     if address in cli_ctx.account_manager.aliases:
         account = cli_ctx.account_manager.load(address)
@@ -37,61 +124,147 @@ def check(cli_ctx: ApeCliContextObject, address: str):
     else:
         account = Address(cli_ctx.conversion_manager.convert(address, AddressType))
 
-    if not (delegate := account.delegate):
+    record = _audit_account(account)
+
+    if not record["delegate"]:
         click.secho("No delegate detected", fg="yellow")
         return 1
 
-    elif not (singleton := DEPLOYMENTS.get(keccak(delegate.code).hex())):
+    elif not (singleton := record["purse"]):
         click.secho("Account is not delegated to Purse", fg="red")
         return 1
 
-    elif singleton != (latest := list(DEPLOYMENTS.values())[-1]):
+    elif not record["latest"]:
         click.secho(
-            f"Not using the latest version of Purse, please upgrade to {latest}",
+            "Not using the latest version of Purse, please upgrade to "
+            f"{list(DEPLOYMENTS.values())[-1]}",
             fg="yellow",
         )
 
     else:
         click.secho("Delegated to latest version of Purse!", fg="green")
 
-    purse = Purse(account)
-
     if not (accessory_deployments := ACCESSORIES.get(singleton, {})):
         click.secho(f"No known accessories for version at {singleton}", fg="yellow")
         return 1
 
-    for accessory_name, accessory_addresses in accessory_deployments.items():
-        for address in accessory_addresses:
-            if purse.has_accessory(accessory := Accessory(address)):
-                if address == (latest := accessory_addresses[-1]):
-                    click.secho(
-                        f"Account has latest accessory '{accessory_name}' for Purse version",
-                        fg="green",
-                    )
-                else:
-                    click.secho(
-                        f"Account has an older accessory '{accessory_name}'"
-                        f" and should be upgraded to {latest}",
-                        fg="yellow",
-                    )
-
-                if not all(
-                    purse.contract.accessoryByMethodId(method.method)
-                    == accessory.address
-                    for method in accessory.methods
-                ):
-                    click.secho(
-                        "Account has not installed all neccessary methods for accessory!",
-                        fg="red",
-                    )
+    for accessory_name in accessory_deployments:
+        if accessory_name not in record["accessories"]:
+            click.secho(
+                f"Account doesn't have accessory '{accessory_name}'", fg="green"
+            )
+            continue
 
-                break
+        elif latest := record["outdated"].get(accessory_name):
+            click.secho(
+                f"Account has an older accessory '{accessory_name}'"
+                f" and should be upgraded to {latest}",
+                fg="yellow",
+            )
 
         else:
             click.secho(
-                f"Account doesn't have accessory '{accessory_name}'", fg="green"
+                f"Account has latest accessory '{accessory_name}' for Purse version",
+                fg="green",
             )
 
+        if accessory_name in record["missing_methods"]:
+            click.secho(
+                "Account has not installed all neccessary methods for accessory!",
+                fg="red",
+            )
+
+
+@cli.command(cls=ConnectedProviderCommand)
+@ape_cli_context()
+@click.argument("addresses", type=click.File("r"), default="-")
+@click.option(
+    "-o",
+    "--output",
+    type=click.File("w"),
+    default="-",
+    help="File to write JSONL records to (defaults to stdout)",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=16,
+    show_default=True,
+    help="Maximum number of accounts checked concurrently",
+)
+def audit(cli_ctx: "ApeCliContextObject", addresses, output, jobs: int):
+    """
+    Check every account listed in ADDRESSES (one per line, defaults to stdin),
+    writing one JSONL record per account.
+    """
+    from ape.api.address import Address
+    from ape.types import AddressType
+
+    from .delegation import get_delegations
+    from .rpc import MAX_BATCH_SIZE
+
+    def resolve_batch(
+        lines: list[str],
+    ) -> list[tuple[str, "tuple[AddressType, Delegation] | Exception"]]:
+        converted: dict[str, AddressType | Exception] = {}
+
+        for line in lines:
+            try:
+                converted[line] = cli_ctx.conversion_manager.convert(line, AddressType)
+
+            except Exception as err:
+                converted[line] = err
+
+        try:
+            # NOTE: Delegations of the whole batch are resolved in one round trip
+            delegations = get_delegations(
+                address for address in converted.values() if isinstance(address, str)
+            )
+
+        except Exception as err:
+            return [(line, err) for line in lines]
+
+        return [
+            (
+                line,
+                (
+                    address
+                    if isinstance(address := converted[line], Exception)
+                    else (address, delegations[address])
+                ),
+            )
+            for line in lines
+        ]
+
+    def audit_line(
+        line: str, resolved: "tuple[AddressType, Delegation] | Exception"
+    ) -> dict:
+        try:
+            if isinstance(resolved, Exception):
+                raise resolved
+
+            address, delegation = resolved
+            return _audit_account(Address(address), delegation)
+
+        except Exception as err:
+            return dict(address=line, error=str(err))
+
+    def batches() -> Iterator[list[str]]:
+        lines = (line for raw_line in addresses if (line := raw_line.strip()))
+
+        while batch := list(islice(lines, MAX_BATCH_SIZE)):
+            yield batch
+
+    # NOTE: Requests in flight are bounded by the number of workers
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        resolved = (
+            item for batch in executor.map(resolve_batch, batches()) for item in batch
+        )
+
+        for record in executor.map(audit_line, *zip(*resolved)):
+            output.write(json.dumps(record) + "\n")
+
 
 @cli.command(cls=ConnectedProviderCommand)
 @ape_cli_context()
@@ -99,13 +272,15 @@ def check(cli_ctx: ApeCliContextObject, address: str):
 @click.argument("accessories", nargs=-1)
 def enable(cli_ctx, account: "AccountAPI", accessories: list[str]):
     """Enable Purse w/ 1 or more Accessories added"""
+    from .accessory import Accessory
+    from .main import Purse
 
     singleton = cli_ctx.chain_manager.contracts.instance_at(
         list(DEPLOYMENTS.values())[-1],
         contract_type=MANIFEST.Purse,
     )
     valid_choices = ACCESSORIES.get(singleton.address, {})
-    accessories: list[Accessory] = [
+    accessories: list["Accessory"] = [
         Accessory(valid_choices.get(name, [])[-1]) for name in accessories
     ]
 
@@ -115,10 +290,45 @@ def enable(cli_ctx, account: "AccountAPI", accessories: list[str]):
         Purse.initialize(account, *accessories, singleton=singleton)
 
 
+@cli.command(cls=ConnectedProviderCommand)
+@ape_cli_context()
+@account_option()
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Only report the updates needed and their gas cost",
+)
+def upgrade(cli_ctx: "ApeCliContextObject", account: "AccountAPI", dry_run: bool):
+    """Upgrade all installed Accessories to their latest versions"""
+    from eth_utils import to_hex
+
+    from .main import Purse
+
+    purse = Purse(account)
+
+    if not (updates := purse.plan_upgrade()):
+        click.secho("All accessories are up to date", fg="green")
+        return
+
+    for method in updates:
+        click.echo(f"- {to_hex(method.method)} => {method.accessory}")
+
+    gas = purse.estimate_updates(updates)
+    cost = sum(gas) * cli_ctx.provider.gas_price
+    click.echo(
+        f"{len(updates)} updates in {len(gas)} transaction(s) using {sum(gas)} gas"
+        f" (~{cost / 10**18:.6f} ether at current gas price)"
+    )
+
+    if not dry_run and click.confirm("Apply updates?"):
+        purse.update(updates)
+
+
 @cli.command(cls=ConnectedProviderCommand)
 @account_option()
 def disable(account: "AccountAPI"):
     """Remove Purse from your account"""
+    from .main import Purse
 
     purse = Purse(account)
     purse.disable()
@@ -138,6 +348,8 @@ def deploy():
 @account_option()
 def singleton(account):
     """Deploy the Purse singleton contract using CreateX"""
+    from ape.contracts import ContractContainer
+    from createx import CreateX
 
     try:
         createx = CreateX()
@@ -159,6 +371,8 @@ def singleton(account):
 @click.argument("accessory")
 def accessory(account, accessory):
     """Deploy a Purse accessory from this project"""
+    from ape.contracts import ContractContainer
+    from createx import CreateX
 
     if not (Accessory := ContractContainer(MANIFEST.get_contract_type(accessory))):
         raise click.UsageError(f"'{accessory}' is not a valid accessory.")
@@ -1,34 +1,52 @@
 import string
-from typing import TYPE_CHECKING, Any
-from ape.contracts import ContractInstance
-from ape.types import AddressType
-from ape.utils import ManagerAccessMixin
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+from ape.contracts import ContractContainer, ContractInstance
+from ape.types import AddressType, HexBytes
 from ape.utils.misc import cached_property
-from eth_pydantic_types import abi
+from eth_utils import to_hex
 from eth_utils.crypto import keccak
 from ethpm_types.abi import MethodABI
-from pydantic import BaseModel, field_validator
+
+from .bytecode import known_selectors, selectors_for_code
+from .checkpoint import save_checkpoint
+from .events import RouteUpdate, get_route_updates, replay_purses
+from .package import MANIFEST
+from .reorg import RouteIndexMixin
 
 if TYPE_CHECKING:
     from .main import Purse
 
 
-class AccessoryMethod(BaseModel):
-    method: abi.bytes4
-    accessory: abi.address
+class AccessoryMethod(NamedTuple):
+    """Route of a single method ID (4 bytes) to the accessory that implements it"""
 
-    @field_validator("method", mode="before")
-    def convert_selector_to_method_id(cls, value: Any) -> Any:
-        if isinstance(value, str) and not all(c in string.hexdigits for c in value):
-            return keccak(text=value)[:4].hex()
+    method: bytes
+    accessory: AddressType
 
-        return value
+    @classmethod
+    def parse(cls, method: "str | bytes", accessory: AddressType) -> "AccessoryMethod":
+        """Create from a method ID (as bytes or hex str) or a method signature"""
+        if isinstance(method, str):
+            if all(c in string.hexdigits for c in method.removeprefix("0x")):
+                method = bytes.fromhex(method.removeprefix("0x"))
 
-    def __hash__(self) -> int:
-        return int(self.accessory.lower().replace("0x", "") + self.method.hex(), 16)
+            else:
+                method = keccak(text=method)[:4]
+
+        if len(method) != 4:
+            raise ValueError(f"Method ID must be 4 bytes, not {len(method)}")
+
+        return cls(bytes(method), accessory)
+
+    def model_dump(self) -> dict:
+        # NOTE: Only needed at the ABI boundary, as an `AccessoryUpdate` struct
+        return {"method": self.method, "accessory": self.accessory}
 
 
-class Accessory(ManagerAccessMixin):
+class Accessory(RouteIndexMixin):
+    _checkpoint_prefix = "accessory"
+
     def __init__(self, address: AddressType | ContractInstance, *purses: "Purse"):
         self.address = self.conversion_manager.convert(address, AddressType)
 
@@ -40,6 +58,10 @@ class Accessory(ManagerAccessMixin):
             purse.address: purse for purse in purses
         }
 
+        # Methods routed to ``self``, indexed by purse address (see `sync`)
+        self._routes: dict[AddressType, set[bytes]] = {}
+        self._init_index()
+
     # TODO: `Accessory.load_package_type(package: uri or PackageManifest, contract_name: str)`
 
     def __repr__(self) -> str:
@@ -62,11 +84,142 @@ class Accessory(ManagerAccessMixin):
     def methods(self) -> list[AccessoryMethod]:
         """List of all methods required to install this accessory"""
 
-        return [
-            AccessoryMethod(method=abi.selector, accessory=self.address)
-            for abi in self.contract.contract_type.abi
-            if isinstance(abi, MethodABI)
-        ]
+        if "contract" in self.__dict__:
+            contract_type = self.contract.contract_type
+
+        # NOTE: Known deployments don't need to fetch their contract type, but are only
+        #       trusted if their code is the runtime in the table
+        elif (
+            method_ids := known_selectors(
+                code := bytes(self.provider.get_code(self.address))
+            )
+        ) is not None:
+            return [
+                AccessoryMethod(method_id, self.address) for method_id in method_ids
+            ]
+
+        else:
+            contract_type = self.chain_manager.contracts.get(
+                self.address, fetch_from_explorer=False, detect_proxy=False
+            )
+
+        if contract_type:
+            method_ids = [
+                keccak(text=abi.selector)[:4]
+                for abi in contract_type.abi
+                if isinstance(abi, MethodABI)
+            ]
+
+        else:
+            # NOTE: Unknown accessory, so read method IDs from its dispatcher instead
+            #       of blocking on an explorer lookup
+            method_ids = list(selectors_for_code(code))
+
+        return [AccessoryMethod(method_id, self.address) for method_id in method_ids]
+
+    def _replay(
+        self, updates: list[RouteUpdate]
+    ) -> list[tuple[AddressType, bytes, bool]]:
+        # NOTE: Undo records are whether each method was routed to ``self`` before
+        undo = []
+        for update in updates:
+            undo.append(
+                (
+                    update.purse,
+                    update.method,
+                    update.method in self._routes.get(update.purse, ()),
+                )
+            )
+            replay_purses([update], self.address, self._routes)
+
+        # NOTE: Only purses touched by ``updates`` can have been added or removed
+        self._sync_purses({update.purse for update in updates})
+        return undo
+
+    def _undo(self, records: list[tuple[AddressType, bytes, bool]]):
+        for purse, method, routed in records:
+            if routed:
+                self._routes.setdefault(purse, set()).add(method)
+
+            elif (methods := self._routes.get(purse)) is not None:
+                methods.discard(method)
+
+                if not methods:
+                    del self._routes[purse]
+
+        self._sync_purses({purse for purse, _, _ in records})
+
+    def _sync_purses(self, addresses: set[AddressType]):
+        from .main import Purse
+
+        for address in addresses:
+            if address not in self._routes:
+                self.purses.pop(address, None)
+
+            elif address not in self.purses:
+                self.purses[address] = Purse(address)
+
+    def _dump_routes(self) -> dict:
+        return {
+            purse: [to_hex(method) for method in methods]
+            for purse, methods in self._routes.items()
+        }
+
+    def _load_routes(self, routes: dict):
+        from .main import Purse
+
+        self._routes = {
+            purse: {HexBytes(method) for method in methods}
+            for purse, methods in routes.items()
+        }
+        self.purses = {
+            purse: self.purses.get(purse) or Purse(purse) for purse in self._routes
+        }
+
+    def sync(
+        self,
+        checkpoint: Path | None = None,
+        stop_block: int | None = None,
+    ) -> int:
+        """
+        Apply all ``AccessoryUpdated`` events involving ``self`` (from any Purse) emitted
+        after the last indexed block, up to ``stop_block`` (defaults to the chain head).
+
+        State is resumed from and saved to ``checkpoint``, which defaults to a file in
+        ape's data folder on live networks, so a restart only queries the newest events.
+
+        Returns the number of events applied.
+        """
+        self._resume(checkpoint)
+
+        if stop_block is None:
+            stop_block = self.chain_manager.blocks.head.number
+
+        if stop_block <= self._last_indexed:
+            return 0
+
+        # NOTE: Events where ``self`` is either side of the update, in chain order
+        #       (an update from ``self`` to ``self`` matches both queries)
+        updates = sorted(
+            {
+                update
+                for search_topics in (
+                    dict(old_accessory=self.address),
+                    dict(new_accessory=self.address),
+                )
+                for update in get_route_updates(
+                    self._last_indexed + 1, stop_block, **search_topics
+                )
+            },
+            key=lambda update: (update.block_number, update.log_index),
+        )
+        self._apply_route_updates(updates)
+        self._mark_indexed(stop_block)
+
+        if self._checkpoint:
+            save_checkpoint(self._checkpoint, self._dump_state())
+
+        return len(updates)
 
     def install(self, bot):
         """
@@ -74,29 +227,20 @@ class Accessory(ManagerAccessMixin):
 
         Manages ``self.purses``, which is state of type ``set[Purse]``.
         """
-        from .main import Purse
-        from .package import MANIFEST
-
-        PurseContractType = MANIFEST.Purse
+        PurseContract = ContractContainer(MANIFEST.Purse)
 
         @bot.on_startup()
         async def load_purses_by_accessory(_ss):
-            df = PurseContractType.AccessoryUpdated.query(
-                "datetime,contract_address,old_accessory,new_accessory",
-            )
-            # TODO: Prune "replacements" (where a newer row undoes an older one)
+            self.sync()
 
-            # NOTE: Use `set` for `O(1)` __contains__ check
-            self.purses = {
-                row.contract_address: Purse(row.contract_address) for row in df
-            }
-
-        @bot.on_(PurseContractType.AccessoryUpdated, old_accessory=self.address)
+        @bot.on_(PurseContract.AccessoryUpdated, old_accessory=self.address)
         async def remove_purse(log):
-            if log.contract_address in self.purses:
-                del self.purses[log.contract_address]
+            self._update_from_log(log)
 
-        @bot.on_(PurseContractType.AccessoryUpdated, new_accessory=self.address)
+        @bot.on_(PurseContract.AccessoryUpdated, new_accessory=self.address)
         async def add_purse(log):
-            if log.contract_address not in self.purses:
-                self.purses[log.contract_address] = Purse(log.contract_address)
+            self._update_from_log(log)
+
+        @bot.on_(self.chain_manager.blocks)
+        async def check_reorg(block):
+            self._check_head(block)
@@ -0,0 +1,202 @@
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+# NOTE: Added to `typing` in 3.11+
+from typing_extensions import Self
+
+from ape.contracts import ContractInstance
+from ape.exceptions import DecodingError
+from ape.logging import logger
+from ape.types import AddressType, HexBytes
+from ape.utils import ManagerAccessMixin
+from eth_abi import decode as abi_decode
+from eth_abi.exceptions import DecodingError as ABIDecodingError
+from eth_utils import to_hex
+from eth_utils.crypto import keccak
+
+from .package import MANIFEST
+from .rpc import batch_request
+
+if TYPE_CHECKING:
+    from ape.api.transactions import ReceiptAPI
+    from ape.contracts.base import ContractMethodHandler
+    from ethpm_types.abi import MethodABI
+
+    from .main import Purse
+
+# NOTE: Limit of a single `Aggregate.aggregate` call
+MAX_CALLS = 100
+# NOTE: Must match `MAX_RETURN_SIZE` in `Aggregate.vy` (longer returndata is truncated)
+MAX_RETURN_SIZE = 512
+
+
+class AggregateResult(NamedTuple):
+    """Result of a call made through the Aggregate accessory"""
+
+    success: bool
+    # NOTE: Decoded w/ the ABI of the method (raw returndata if recorded w/o one), or
+    #       ``None`` if the call failed
+    value: Any
+
+
+class Aggregate(ManagerAccessMixin):
+    """
+    Records calls to make through the Aggregate accessory, decoding the result of every
+    call with the ABI of its method. Calls that are allowed to fail (incl. those whose
+    result can't be decoded, e.g. as returndata is truncated) result in ``(False, None)``.
+
+    Usage example::
+
+        calls = purse.aggregate_calls()
+        for holder in holders:
+            calls.add(token.balanceOf, holder)
+
+        # NOTE: Reads via `eth_call` from the Purse, in one round trip
+        balances = [balance for _, balance in calls()]
+    """
+
+    def __init__(self, purse: "Purse"):
+        self.purse = purse
+        self.calls: list[dict] = []
+        self.abis: list["MethodABI | None"] = []
+
+    def add(
+        self,
+        call: "ContractMethodHandler",
+        *args,
+        allow_failure: bool = False,
+        value: Any = 0,
+    ) -> Self:
+        """Record a call to a contract method"""
+        data = call.encode_input(*args)
+        # NOTE: Decode with the overload matching the encoded method ID
+        abi = next(
+            abi for abi in call.abis if keccak(text=abi.selector)[:4] == data[:4]
+        )
+        return self.add_raw(
+            call.contract.address,
+            data,
+            allow_failure=allow_failure,
+            value=value,
+            abi=abi,
+        )
+
+    def add_raw(
+        self,
+        target: Any,
+        data: bytes,
+        allow_failure: bool = False,
+        value: Any = 0,
+        abi: "MethodABI | None" = None,
+    ) -> Self:
+        """Record a call to ``target`` with calldata ``data`` (results are not decoded)"""
+        self.abis.append(abi)
+        self.calls.append(
+            dict(
+                target=self.conversion_manager.convert(target, AddressType),
+                value=self.conversion_manager.convert(value, int),
+                allow_failure=allow_failure,
+                data=data,
+            )
+        )
+        return self
+
+    @property
+    def _abi(self) -> "MethodABI":
+        return MANIFEST.Aggregate.mutable_methods["aggregate"]
+
+    def _chunks(self) -> list[list[dict]]:
+        return [
+            self.calls[idx : idx + MAX_CALLS]
+            for idx in range(0, len(self.calls), MAX_CALLS)
+        ]
+
+    def _decode_results(self, results: list) -> list[AggregateResult]:
+        ecosystem = self.provider.network.ecosystem
+        decoded: list[AggregateResult] = []
+
+        for abi, call, (success, return_data) in zip(
+            self.abis, self.calls, results, strict=True
+        ):
+            if not success:
+                decoded.append(AggregateResult(False, None))
+                continue
+
+            elif abi is None:
+                decoded.append(AggregateResult(True, HexBytes(return_data)))
+                continue
+
+            try:
+                if len(return_data) == MAX_RETURN_SIZE:
+                    # NOTE: May be truncated, which ape's (lenient) decoding accepts
+                    abi_decode(
+                        [output.canonical_type for output in abi.outputs], return_data
+                    )
+
+                value = ecosystem.decode_returndata(abi, HexBytes(return_data))
+
+            except (ABIDecodingError, DecodingError) as err:
+                if not call["allow_failure"]:
+                    raise DecodingError(str(err)) from err
+
+                # NOTE: e.g. returndata was truncated, which is expected to happen
+                logger.debug(
+                    f"Could not decode result of call to {call['target']}: {err}"
+                )
+                decoded.append(AggregateResult(False, None))
+                continue
+
+            decoded.append(
+                AggregateResult(
+                    True,
+                    (
+                        value[0]
+                        if isinstance(value, (list, tuple)) and len(value) == 1
+                        else value
+                    ),
+                )
+            )
+
+        return decoded
+
+    def __call__(self, block_id: str = "latest") -> list[AggregateResult]:
+        """
+        Make all recorded calls via ``eth_call`` from the Purse, batching every set of
+        ``MAX_CALLS`` calls into a single JSON-RPC request.
+        """
+        ecosystem = self.provider.network.ecosystem
+        method_id = ecosystem.get_method_selector(self._abi)
+        responses = batch_request(
+            (
+                "eth_call",
+                [
+                    {
+                        "from": self.purse.address,
+                        "to": self.purse.address,
+                        "data": to_hex(
+                            method_id + ecosystem.encode_calldata(self._abi, chunk)
+                        ),
+                    },
+                    block_id,
+                ],
+            )
+            for chunk in self._chunks()
+        )
+
+        return self._decode_results(
+            [
+                result
+                for response in responses
+                for result in ecosystem.decode_returndata(
+                    self._abi, HexBytes(response)
+                )[0]
+            ]
+        )
+
+    def transact(self, **txn_args) -> list["ReceiptAPI"]:
+        """Make all recorded calls in transactions of ``MAX_CALLS`` calls each"""
+        if "sender" not in txn_args and self.purse.wallet:
+            txn_args["sender"] = self.purse.wallet
+
+        # NOTE: Not cached, so the Purse's own contract type is not overwritten
+        contract = ContractInstance(self.purse.address, MANIFEST.Aggregate)
+        return [contract.aggregate(chunk, **txn_args) for chunk in self._chunks()]
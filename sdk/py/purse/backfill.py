@@ -0,0 +1,215 @@
+import time
+from collections import deque
+from contextlib import suppress
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from ape.exceptions import ProviderError
+from ape.logging import logger
+from ape.utils import ManagerAccessMixin
+from requests import HTTPError
+from web3.exceptions import Web3RPCError
+
+if TYPE_CHECKING:
+    from ape.types import LogFilter
+
+# NOTE: Defaults for providers without their own page size (and concurrency limit)
+DEFAULT_RANGE = 5_000
+MAX_WORKERS = 8
+MAX_RETRIES = 5
+BACKOFF = 0.5  # seconds, doubled after every failed attempt
+# NOTE: Number of ranges in a row that must succeed before the range size is doubled again
+GROW_AFTER = 4
+
+# NOTE: Errors of common providers when a range has too many blocks or results, which are
+#       fetched again as two halves rather than retried
+RANGE_ERRORS = (
+    "block range",
+    "range too large",
+    "range is too large",
+    "range limit",
+    "query returned more than",
+    "response size",
+    "too many results",
+    "query timeout",
+)
+# NOTE: Errors of common providers when requests are rate limited, which are retried
+#       (w/ backoff) over the same range
+RATE_LIMIT_ERRORS = (
+    "rate limit",
+    "too many requests",
+    "request rate exceeded",
+)
+
+
+class _RangeTooLarge(Exception):
+    pass
+
+
+def is_rate_limited(err: Exception) -> bool:
+    """Whether ``err`` means a request was rejected for exceeding the provider's rate limit"""
+    message = str(err).lower()
+    return any(pattern in message for pattern in RATE_LIMIT_ERRORS)
+
+
+def is_range_error(err: Exception) -> bool:
+    """Whether ``err`` means a log query should be retried over a smaller block range"""
+    if is_rate_limited(err):
+        return False
+
+    message = str(err).lower()
+    return any(pattern in message for pattern in RANGE_ERRORS)
+
+
+class LogBackfill(ManagerAccessMixin):
+    """
+    Fetches the logs matching ``log_filter`` via ``eth_getLogs`` over block ranges queried
+    concurrently (up to ``max_workers`` at once), streaming the logs in chain order.
+
+    Ranges rejected by the provider (e.g. for spanning too many blocks or results) are split
+    in half, and later ranges use the reduced size, which doubles again (up to
+    ``chunk_size``) after a few ranges in a row succeed. Other errors (incl. rate limits)
+    are retried with exponential backoff, up to ``max_retries`` times.
+
+    Each range is fetched with a single ``eth_getLogs`` request. If ``decode`` is given, it
+    is called with the raw logs of the range (from ``web3.eth.get_logs``), and otherwise
+    the logs are decoded as ``ContractLog`` (by the provider's ``get_contract_logs``, so
+    ranges are also capped at the provider's ``block_page_size``).
+    """
+
+    def __init__(
+        self,
+        log_filter: "LogFilter",
+        chunk_size: int | None = None,
+        max_workers: int | None = None,
+        max_retries: int = MAX_RETRIES,
+        backoff: float = BACKOFF,
+        decode: Callable[[list[dict]], list] | None = None,
+    ):
+        self.log_filter = log_filter
+        self.decode = decode
+        if decode is None:
+            # NOTE: `get_contract_logs` pages larger ranges sequentially, so keep each range
+            #       within one page of the provider
+            page_size = getattr(self.provider, "block_page_size", DEFAULT_RANGE)
+            chunk_size = min(chunk_size or page_size, page_size)
+
+        self.chunk_size = self.max_chunk_size = chunk_size or DEFAULT_RANGE
+        self.max_workers = max_workers or min(
+            MAX_WORKERS, getattr(self.provider, "concurrency", MAX_WORKERS)
+        )
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def _request(self, start_block: int, stop_block: int) -> list[Any]:
+        # NOTE: A single `eth_getLogs` request either way (see ``__init__``)
+        page_filter = self.log_filter.model_copy(
+            update=dict(start_block=start_block, stop_block=stop_block)
+        )
+
+        if self.decode:
+            return self.decode(
+                self.provider.web3.eth.get_logs(page_filter.model_dump(mode="json"))
+            )
+
+        return list(self.provider.get_contract_logs(page_filter))
+
+    def _fetch(self, start_block: int, stop_block: int) -> list[Any]:
+        attempt = 0
+
+        while True:
+            try:
+                return self._request(start_block, stop_block)
+
+            except (ProviderError, HTTPError, Web3RPCError) as err:
+                if stop_block > start_block and is_range_error(err):
+                    raise _RangeTooLarge() from err
+
+                elif attempt >= self.max_retries:
+                    raise
+
+                delay = self.backoff * 2**attempt
+                if (
+                    isinstance(err, HTTPError)
+                    and err.response is not None
+                    and (retry_after := err.response.headers.get("Retry-After"))
+                ):
+                    # NOTE: Rate limited responses may say how long to wait
+                    with suppress(ValueError):
+                        delay = max(delay, float(retry_after))
+
+                logger.debug(
+                    f"Fetching logs of blocks {start_block}-{stop_block} failed"
+                    f" ({err}), retrying in {delay:.1f}s"
+                )
+
+            time.sleep(delay)
+            attempt += 1
+
+    def __iter__(self) -> Iterator[Any]:
+        start_block = self.log_filter.start_block
+        stop_block = self.log_filter.stop_block
+        if stop_block is None:
+            stop_block = self.chain_manager.blocks.head.number
+
+        # NOTE: Ranges in chain order, whose logs are yielded as soon as all earlier
+        #       ranges are done
+        pending: deque[tuple[int, int, Future]] = deque()
+        cursor = start_block
+        successes = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+
+            def submit(start: int, stop: int) -> tuple[int, int, Future]:
+                return start, stop, executor.submit(self._fetch, start, stop)
+
+            try:
+                while pending or cursor <= stop_block:
+                    while cursor <= stop_block and len(pending) < self.max_workers:
+                        stop = min(cursor + self.chunk_size - 1, stop_block)
+                        pending.append(submit(cursor, stop))
+                        cursor = stop + 1
+
+                    start, stop, future = pending.popleft()
+
+                    try:
+                        logs = future.result()
+
+                    except _RangeTooLarge:
+                        middle = (start + stop) // 2
+                        self.chunk_size = max(
+                            1, min(self.chunk_size, middle - start + 1)
+                        )
+                        successes = 0
+                        pending.appendleft(submit(middle + 1, stop))
+                        pending.appendleft(submit(start, middle))
+                        continue
+
+                    # NOTE: Limits may depend on the number of results, so try larger
+                    #       ranges again where there are fewer logs
+                    successes += 1
+                    if (
+                        successes >= GROW_AFTER
+                        and self.chunk_size < self.max_chunk_size
+                    ):
+                        self.chunk_size = min(2 * self.chunk_size, self.max_chunk_size)
+                        successes = 0
+
+                    yield from logs
+
+            finally:
+                # NOTE: Don't wait on ranges that will never be yielded
+                for *_, future in pending:
+                    future.cancel()
+
+
+def backfill_logs(
+    log_filter: "LogFilter",
+    chunk_size: int | None = None,
+    max_workers: int | None = None,
+    decode: Callable[[list[dict]], list] | None = None,
+) -> Iterator[Any]:
+    """Fetch all logs matching ``log_filter`` in chain order (see ``LogBackfill``)"""
+    yield from LogBackfill(
+        log_filter, chunk_size=chunk_size, max_workers=max_workers, decode=decode
+    )
@@ -0,0 +1,109 @@
+from typing import TYPE_CHECKING, Any
+
+# NOTE: Added to `typing` in 3.11+
+from typing_extensions import Self
+
+from ape.types import AddressType
+from ape.utils import ManagerAccessMixin
+
+if TYPE_CHECKING:
+    from ape.api.transactions import ReceiptAPI
+    from ape.contracts.base import ContractMethodHandler
+
+    from .main import Purse
+
+# NOTE: Limits of a single `Multicall.execute` call
+MAX_CALLS = 100
+MAX_CALLDATA_SIZE = 2048
+
+
+class Batch(ManagerAccessMixin):
+    """
+    Records calls and value transfers, then sends them from a Purse using the fewest
+    ``execute`` transactions allowed by the Multicall accessory and the block gas limit.
+
+    Usage example::
+
+        with purse.batch() as batch:
+            batch.add(token.transfer, receiver, amount)
+            batch.transfer(other, "1 ether")
+
+        batch.receipts  # The receipt of the transaction that made each call
+    """
+
+    def __init__(self, purse: "Purse", gas_limit: int | None = None, **txn_args):
+        self.purse = purse
+        self.gas_limit = gas_limit
+        self.txn_args = txn_args
+        self.calls: list[dict] = []
+        self.receipts: list["ReceiptAPI"] = []
+
+    def add(self, call: "ContractMethodHandler", *args, value: Any = 0) -> Self:
+        """Record a call to a contract method, optionally sending ``value`` with it"""
+        return self.add_raw(
+            call.contract.address, call.encode_input(*args), value=value
+        )
+
+    def transfer(self, target: Any, value: Any) -> Self:
+        """Record a transfer of ``value`` to ``target``"""
+        return self.add_raw(target, b"", value=value)
+
+    def add_raw(self, target: Any, data: bytes, value: Any = 0) -> Self:
+        """Record a call to ``target`` with calldata ``data``"""
+        if len(data) > MAX_CALLDATA_SIZE:
+            raise ValueError(
+                f"Calldata is {len(data)} bytes, the maximum is {MAX_CALLDATA_SIZE}"
+            )
+
+        self.calls.append(
+            dict(
+                target=self.conversion_manager.convert(target, AddressType),
+                value=self.conversion_manager.convert(value, int),
+                data=data,
+            )
+        )
+        return self
+
+    def _next_size(self, calls: list[dict], sender: Any) -> int:
+        gas_limit = self.gas_limit or self.provider.max_gas
+        size = min(MAX_CALLS, len(calls))
+
+        while size > 1:
+            gas = self.purse.execute.estimate_gas_cost(calls[:size], sender=sender)
+            if gas <= gas_limit:
+                break
+
+            # NOTE: Gas scales about linearly with the number of calls
+            size = max(1, min(size - 1, size * gas_limit // gas))
+
+        return size
+
+    def flush(self) -> list["ReceiptAPI"]:
+        """
+        Send all recorded calls (in order), returning the receipt of the transaction that
+        made each call.
+        """
+        txn_args = dict(self.txn_args)
+        if "sender" not in txn_args and self.purse.wallet:
+            txn_args["sender"] = self.purse.wallet
+
+        receipts: list["ReceiptAPI"] = []
+
+        while self.calls:
+            # NOTE: Sized right before sending, as calls may depend on earlier ones
+            size = self._next_size(self.calls, txn_args.get("sender"))
+            receipt = self.purse.execute(self.calls[:size], **txn_args)
+            # NOTE: Unsent calls are kept if sending fails, and the receipts of the calls
+            #       that were sent before it are recorded
+            self.calls = self.calls[size:]
+            self.receipts.extend([receipt] * size)
+            receipts.extend([receipt] * size)
+
+        return receipts
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
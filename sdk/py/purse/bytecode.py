@@ -0,0 +1,130 @@
+from threading import Lock
+from typing import Iterable
+
+from ape.types import AddressType, HexBytes
+from ape.utils import ManagerAccessMixin
+from eth_utils import to_hex
+from eth_utils.crypto import keccak
+
+from .checkpoint import load_checkpoint, save_checkpoint
+from .package import SELECTORS
+from .rpc import batch_request
+
+PUSH1 = 0x60
+PUSH4 = 0x63
+PUSH32 = 0x7F
+EQ = 0x14
+XOR = 0x18
+JUMPI = 0x57
+
+# codehash => method IDs, for all code resolved in this process
+_selectors_by_codehash: dict[str, tuple[HexBytes, ...]] = {}
+# NOTE: Sizes of known runtimes, to hash only that much of code w/ immutables appended
+_known_sizes = sorted({size for size, _ in SELECTORS.values()})
+_codehash_locks: dict[str, Lock] = {}
+
+
+def _disassemble(code: bytes) -> list[tuple[int, bytes]]:
+    instructions = []
+    pc = 0
+
+    while pc < len(code):
+        opcode = code[pc]
+        size = opcode - PUSH1 + 1 if PUSH1 <= opcode <= PUSH32 else 0
+        instructions.append((opcode, code[pc + 1 : pc + 1 + size]))
+        pc += 1 + size
+
+    return instructions
+
+
+def extract_selectors(code: bytes) -> tuple[HexBytes, ...]:
+    """
+    Scan runtime ``code`` for the method IDs its dispatcher matches calldata against.
+
+    Recognizes the selector comparisons emitted by Solidity (``PUSH4 <id> EQ ... JUMPI``)
+    and by Vyper's linear and sparse dispatchers (``PUSH4 <id> DUP2 XOR ... JUMPI``).
+    """
+    instructions = _disassemble(code)
+    selectors: dict[HexBytes, None] = {}
+
+    for idx, (opcode, method_id) in enumerate(instructions):
+        if opcode != PUSH4:
+            continue
+
+        following = [opcode for opcode, _ in instructions[idx + 1 : idx + 5]]
+        if (EQ in following[:2] or XOR in following[:2]) and JUMPI in following:
+            selectors[HexBytes(method_id)] = None
+
+    return tuple(selectors)
+
+
+def known_selectors(code: bytes) -> tuple[HexBytes, ...] | None:
+    """
+    Method IDs of runtime ``code`` from ``SELECTORS``, if it is the runtime of a known
+    accessory (optionally followed by its immutables).
+    """
+    for size in _known_sizes:
+        if size > len(code):
+            break
+
+        elif (entry := SELECTORS.get(keccak(code[:size]).hex())) and entry[0] == size:
+            return tuple(HexBytes(method) for method in entry[1])
+
+    return None
+
+
+def selectors_for_code(code: bytes) -> tuple[HexBytes, ...]:
+    """
+    Method IDs dispatched by runtime ``code``, resolved once per codehash and cached on disk.
+    """
+    codehash = keccak(code).hex()
+
+    # NOTE: Concurrent lookups of the same code wait for the first one to resolve it
+    #       (`setdefault` is atomic, so they all get the same lock)
+    with _codehash_locks.setdefault(codehash, Lock()):
+        if (selectors := _selectors_by_codehash.get(codehash)) is not None:
+            return selectors
+
+        path = (
+            ManagerAccessMixin.config_manager.DATA_FOLDER
+            / "purse"
+            / "selectors"
+            / f"{codehash}.json"
+        )
+
+        if (selectors := known_selectors(code)) is not None:
+            pass  # NOTE: No need to cache these on disk
+
+        elif (cached := load_checkpoint(path)) is not None:
+            # NOTE: Older caches are a bare list of method IDs
+            methods = cached["selectors"] if isinstance(cached, dict) else cached
+            selectors = tuple(HexBytes(method) for method in methods)
+
+        else:
+            selectors = extract_selectors(code)
+            save_checkpoint(
+                path, dict(selectors=[to_hex(method) for method in selectors])
+            )
+
+        _selectors_by_codehash[codehash] = selectors
+        return selectors
+
+
+def get_selectors(
+    addresses: Iterable[AddressType],
+) -> dict[AddressType, tuple[HexBytes, ...]]:
+    """
+    Method IDs dispatched by the contract deployed at each of ``addresses``, fetching all
+    of their code in a single batched request.
+    """
+    addresses = list(dict.fromkeys(addresses))
+
+    return {
+        address: selectors_for_code(bytes(HexBytes(code)))
+        for address, code in zip(
+            addresses,
+            batch_request(
+                ("eth_getCode", [address, "latest"]) for address in addresses
+            ),
+        )
+    }
@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+from ape.utils import ManagerAccessMixin
+
+
+def default_checkpoint_path(name: str) -> Path | None:
+    """
+    Default file to persist indexed state ``name`` to for the connected network.
+
+    Returns ``None`` for local (and forked) networks, whose state doesn't outlive the process.
+    """
+    network = ManagerAccessMixin.provider.network
+
+    if network.is_dev:
+        return None
+
+    return (
+        ManagerAccessMixin.config_manager.DATA_FOLDER
+        / "purse"
+        / network.ecosystem.name
+        / network.name
+        / f"{name}.json"
+    )
+
+
+def load_checkpoint(path: Path) -> dict | None:
+    """Load the state previously saved to ``path``, if there is any."""
+
+    if not path.is_file():
+        return None
+
+    return json.loads(path.read_text())
+
+
+def save_checkpoint(path: Path, state: dict):
+    """Atomically save ``state`` to ``path``, so a crash never leaves a partial checkpoint."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(state))
+    tmp_path.replace(path)
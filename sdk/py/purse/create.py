@@ -0,0 +1,145 @@
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import count
+
+import rlp
+from ape.types import AddressType, HexBytes
+from eth_utils import to_checksum_address
+from eth_utils.crypto import keccak
+
+# NOTE: Must match the default `code_offset` of `create_from_blueprint` (in `Create.vy`),
+#       which skips the ERC-5202 preamble (`0xFE7100`) of blueprints without data
+BLUEPRINT_CODE_OFFSET = 3
+BLUEPRINT_PREAMBLE = b"\xfe\x71\x00"
+
+# NOTE: Number of salts each worker process checks per task
+MINE_BATCH_SIZE = 50_000
+
+
+def create_address(deployer: AddressType, nonce: int) -> AddressType:
+    """Address deployed to by ``CREATE`` from ``deployer`` at account ``nonce``"""
+    return to_checksum_address(keccak(rlp.encode([HexBytes(deployer), nonce]))[12:])
+
+
+def create2_address(
+    deployer: AddressType,
+    salt: bytes,
+    initcode: bytes,
+) -> AddressType:
+    """Address deployed to by ``CREATE2`` from ``deployer`` with ``salt`` and ``initcode``"""
+    if len(salt) != 32:
+        raise ValueError(f"Salt must be 32 bytes, not {len(salt)}")
+
+    return to_checksum_address(
+        keccak(b"\xff" + HexBytes(deployer) + salt + keccak(initcode))[12:]
+    )
+
+
+def blueprint_initcode(blueprint_code: bytes, args: bytes = b"") -> bytes:
+    """Initcode deployed by the Create accessory from a blueprint, with (ABI-encoded) args"""
+    if not blueprint_code.startswith(BLUEPRINT_PREAMBLE):
+        raise ValueError("Not an ERC-5202 blueprint (without data)")
+
+    return blueprint_code[BLUEPRINT_CODE_OFFSET:] + args
+
+
+def _mine_batch(
+    deployer: bytes,
+    initcode_hash: bytes,
+    salt_prefix: bytes,
+    start: int,
+    size: int,
+    pattern: str,
+) -> tuple[bytes, AddressType] | None:
+    matches = re.compile(pattern).match
+    head = b"\xff" + deployer
+    tail = initcode_hash
+    counter_size = 32 - len(salt_prefix)
+
+    for counter in range(start, start + size):
+        salt = salt_prefix + counter.to_bytes(counter_size, "big")
+        address = keccak(head + salt + tail)[12:]
+
+        if matches(address.hex()):
+            return salt, to_checksum_address(address)
+
+    return None
+
+
+def mine_salt(
+    deployer: AddressType,
+    initcode: bytes,
+    prefix: str | None = None,
+    pattern: str | None = None,
+    salt_prefix: bytes | None = None,
+    max_workers: int | None = None,
+    max_attempts: int | None = None,
+    batch_size: int = MINE_BATCH_SIZE,
+) -> tuple[bytes, AddressType]:
+    """
+    Search for a salt making ``CREATE2`` from ``deployer`` with ``initcode`` deploy to an
+    address starting with the hex ``prefix`` (or matching the regex ``pattern``, against the
+    lowercase hex address without ``0x``), using batches of salts across ``max_workers``
+    processes (defaults to all cores).
+
+    Salts start with ``salt_prefix`` (defaults to 16 random bytes) followed by a counter.
+    Raises ``ValueError`` if nothing is found within ``max_attempts`` salts.
+    """
+    if (prefix is None) == (pattern is None):
+        raise ValueError("Must provide one of `prefix` or `pattern`")
+
+    elif prefix is not None:
+        pattern = re.escape(prefix.lower().removeprefix("0x"))
+
+    if salt_prefix is None:
+        salt_prefix = os.urandom(16)
+
+    elif len(salt_prefix) >= 32:
+        raise ValueError("Salt prefix must leave room for a counter")
+
+    # NOTE: Skip the zero salt, which the Create accessory uses for plain `CREATE`
+    starts = count(1 if not any(salt_prefix) else 0, batch_size)
+    args = (bytes(HexBytes(deployer)), keccak(initcode), salt_prefix)
+
+    def batches():
+        for start in starts:
+            if max_attempts is not None and start >= max_attempts:
+                return
+
+            size = batch_size
+            if max_attempts is not None:
+                size = min(size, max_attempts - start)
+
+            yield start, size
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        for start, size in batches():
+            if result := _mine_batch(*args, start, size, pattern):
+                return result
+
+        raise ValueError(f"No salt found in {max_attempts} attempts")
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        tasks = batches()
+        # NOTE: Keep every worker busy, with one batch queued up behind it
+        pending: set[Future] = {
+            executor.submit(_mine_batch, *args, start, size, pattern)
+            for _, (start, size) in zip(range(2 * max_workers), tasks)
+        }
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if result := future.result():
+                    for other in pending:
+                        other.cancel()
+
+                    return result
+
+                elif (task := next(tasks, None)) is not None:
+                    pending.add(executor.submit(_mine_batch, *args, *task, pattern))
+
+    raise ValueError(f"No salt found in {max_attempts} attempts")
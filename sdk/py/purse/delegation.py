@@ -0,0 +1,80 @@
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+from eth_pydantic_types import HexBytes
+from eth_utils import to_checksum_address
+from eth_utils.crypto import keccak
+
+from .package import DEPLOYMENTS
+from .rpc import batch_request
+
+if TYPE_CHECKING:
+    from ape.types import AddressType
+
+# NOTE: EIP-7702 sets a delegated account's code to `0xef0100 || address`
+DELEGATION_DESIGNATOR = bytes.fromhex("ef0100")
+
+# NOTE: Codehash of every delegate seen so far, where known singletons resolve to their
+#       version without downloading their code
+_codehash_by_delegate: dict["AddressType", str] = {
+    singleton: codehash for codehash, singleton in DEPLOYMENTS.items()
+}
+
+
+class Delegation(NamedTuple):
+    delegate: "AddressType | None"
+    # NOTE: Address of the known Purse version with the same code as `delegate`
+    purse: "AddressType | None"
+
+
+def parse_delegate(code: bytes) -> "AddressType | None":
+    """Address that ``code`` delegates to, if it is an EIP-7702 delegation designator"""
+
+    if len(code) != 23 or not code.startswith(DELEGATION_DESIGNATOR):
+        return None
+
+    return to_checksum_address(code[3:])
+
+
+def get_delegations(
+    accounts: Iterable["AddressType"],
+    block_id: str = "latest",
+) -> dict["AddressType", Delegation]:
+    """
+    Resolve the delegate and Purse version of every account in ``accounts``.
+
+    The code of every account is fetched in a single batched request, plus one more for
+    the code of any delegates that were never seen before.
+    """
+    accounts = list(dict.fromkeys(accounts))
+    delegates = {
+        account: parse_delegate(HexBytes(code))
+        for account, code in zip(
+            accounts,
+            batch_request(("eth_getCode", [account, block_id]) for account in accounts),
+        )
+    }
+
+    if unknown_delegates := list(
+        {
+            delegate
+            for delegate in delegates.values()
+            if delegate and delegate not in _codehash_by_delegate
+        }
+    ):
+        for delegate, code in zip(
+            unknown_delegates,
+            batch_request(
+                ("eth_getCode", [delegate, block_id]) for delegate in unknown_delegates
+            ),
+        ):
+            # NOTE: Delegates without code yet may still be deployed to later
+            if code := HexBytes(code):
+                _codehash_by_delegate[delegate] = keccak(code).hex()
+
+    return {
+        account: Delegation(
+            delegate=delegate,
+            purse=DEPLOYMENTS.get(_codehash_by_delegate.get(delegate, "")),
+        )
+        for account, delegate in delegates.items()
+    }
@@ -0,0 +1,255 @@
+from functools import lru_cache
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, NamedTuple
+
+from ape.types import AddressType, HexBytes, LogFilter
+from ape.utils import ZERO_ADDRESS
+from eth_utils import to_checksum_address
+from eth_utils.crypto import keccak
+
+from .package import MANIFEST
+
+if TYPE_CHECKING:
+    from ape.types import ContractLog
+
+# NOTE: Every field of `AccessoryUpdated` is indexed, so logs are decoded from topics only
+ACCESSORY_UPDATED_TOPIC = keccak(text="AccessoryUpdated(bytes4,address,address)")
+_ACCESSORY_UPDATED_TOPIC_HEX = "0x" + ACCESSORY_UPDATED_TOPIC.hex()
+
+
+class RouteUpdate(NamedTuple):
+    """A decoded ``AccessoryUpdated`` event emitted by a Purse"""
+
+    purse: AddressType
+    method: bytes
+    old_accessory: AddressType
+    new_accessory: AddressType
+    block_number: int
+    log_index: int
+    # NOTE: Used to detect reorgs, if known
+    block_hash: HexBytes | None = None
+
+    @classmethod
+    def from_log(cls, log: "ContractLog") -> "RouteUpdate":
+        args = log.event_arguments
+        return cls(
+            log.contract_address,
+            bytes(args["method"]),
+            args["old_accessory"],
+            args["new_accessory"],
+            log.block_number,
+            log.log_index,
+            HexBytes(log.block_hash) if log.block_hash else None,
+        )
+
+
+@lru_cache(maxsize=4096)
+def _to_address(value: bytes | str) -> AddressType:
+    # NOTE: Checksumming dominates decoding, and the same addresses (and topics) repeat a
+    #       lot, so cache by the raw value (incl. the padding of topics)
+    return to_checksum_address(_to_bytes(value)[-20:])
+
+
+def _to_int(value: int | str) -> int:
+    return int(value, 16) if isinstance(value, str) else value
+
+
+def _to_bytes(value: bytes | str) -> bytes:
+    # NOTE: Much faster than `HexBytes` for the hex strings of raw JSON-RPC responses
+    return bytes.fromhex(value[2:]) if isinstance(value, str) else bytes(value)
+
+
+def _is_accessory_updated(log: dict) -> bool:
+    topics = log["topics"]
+    return len(topics) == 4 and (
+        topics[0].lower() == _ACCESSORY_UPDATED_TOPIC_HEX
+        if isinstance(topics[0], str)
+        else topics[0] == ACCESSORY_UPDATED_TOPIC
+    )
+
+
+def decode_route_updates(logs: Iterable[dict]) -> list[RouteUpdate]:
+    """
+    Decode raw ``AccessoryUpdated`` logs (as returned by ``eth_getLogs`` or found in a
+    receipt) straight from their topics, skipping logs of any other event.
+    """
+    updates = []
+
+    for log in logs:
+        if not _is_accessory_updated(log):
+            continue
+
+        topics = log["topics"]
+        block_hash = log.get("blockHash")
+        updates.append(
+            RouteUpdate(
+                _to_address(log["address"]),
+                _to_bytes(topics[1])[:4],
+                _to_address(topics[2]),
+                _to_address(topics[3]),
+                _to_int(log["blockNumber"]),
+                _to_int(log["logIndex"]),
+                HexBytes(block_hash) if block_hash else None,
+            )
+        )
+
+    return updates
+
+
+def route_update_columns(logs: Iterable[dict]) -> dict[str, Any]:
+    """
+    Decode raw ``AccessoryUpdated`` logs (skipping any other event) into NumPy columns, for
+    bulk processing of backfills: ``purse``, ``old_accessory`` and ``new_accessory`` as rows
+    of 20 bytes, ``method`` as rows of 4 bytes, ``block_number`` and ``log_index``.
+    """
+    try:
+        import numpy as np
+
+    except ImportError as err:
+        raise ImportError(
+            "`numpy` is required for decoding into columns (`pip install purse-py[numpy]`)"
+        ) from err
+
+    # NOTE: Topics returned by `eth_getLogs` are lowercase, so only check others in full
+    logs = [
+        log
+        for log in logs
+        if (
+            len(topics := log["topics"]) == 4
+            and topics[0] == _ACCESSORY_UPDATED_TOPIC_HEX
+        )
+        or _is_accessory_updated(log)
+    ]
+    count = len(logs)
+
+    def column(values: list, start: int, stop: int) -> "np.ndarray":
+        # NOTE: Only bytes ``start:stop`` of every value, decoded all at once
+        if values and isinstance(values[0], str):
+            data = bytes.fromhex(
+                "".join([value[2 + 2 * start : 2 + 2 * stop] for value in values])
+            )
+
+        else:
+            data = b"".join([bytes(value)[start:stop] for value in values])
+
+        return np.frombuffer(data, dtype=np.uint8).reshape(count, stop - start)
+
+    def int_column(values: list, dtype: type) -> "np.ndarray":
+        if values and isinstance(values[0], str):
+            return np.fromiter(map(int, values, repeat(16, count)), dtype, count)
+
+        return np.array(values, dtype=dtype)
+
+    return dict(
+        purse=column([log["address"] for log in logs], 0, 20),
+        method=column([log["topics"][1] for log in logs], 0, 4),
+        old_accessory=column([log["topics"][2] for log in logs], 12, 32),
+        new_accessory=column([log["topics"][3] for log in logs], 12, 32),
+        block_number=int_column([log["blockNumber"] for log in logs], np.uint64),
+        log_index=int_column([log["logIndex"] for log in logs], np.uint32),
+    )
+
+
+def replay_routes(
+    updates: Iterable[RouteUpdate],
+    routes: dict[bytes, AddressType] | None = None,
+) -> dict[bytes, AddressType]:
+    """
+    Fold ``updates`` (in chain order) into the final method ID => accessory routing table,
+    starting from ``routes`` (which is modified in place) if provided.
+    """
+    routes = {} if routes is None else routes
+
+    for update in updates:
+        if update.new_accessory == ZERO_ADDRESS:
+            routes.pop(update.method, None)
+
+        else:
+            routes[update.method] = update.new_accessory
+
+    return routes
+
+
+def replay_purses(
+    updates: Iterable[RouteUpdate],
+    accessory: AddressType,
+    routes: dict[AddressType, set[bytes]] | None = None,
+) -> dict[AddressType, set[bytes]]:
+    """
+    Fold ``updates`` (in chain order) into the set of method IDs each purse currently routes
+    to ``accessory``, starting from ``routes`` (which is modified in place) if provided.
+
+    Purses are dropped as soon as none of their methods route to ``accessory`` anymore.
+    """
+    routes = {} if routes is None else routes
+
+    for update in updates:
+        if update.new_accessory == accessory:
+            routes.setdefault(update.purse, set()).add(update.method)
+
+        elif (methods := routes.get(update.purse)) is not None:
+            # NOTE: Method was replaced or removed
+            methods.discard(update.method)
+
+            if not methods:
+                del routes[update.purse]
+
+    return routes
+
+
+def _route_update_filter(
+    start_block: int,
+    stop_block: int,
+    addresses: list[AddressType] | None,
+    search_topics: dict[str, Any],
+) -> LogFilter:
+    return LogFilter.from_event(
+        MANIFEST.Purse.events["AccessoryUpdated"],
+        search_topics=search_topics,
+        addresses=addresses,
+        start_block=start_block,
+        stop_block=stop_block,
+    )
+
+
+def get_route_updates(
+    start_block: int,
+    stop_block: int,
+    addresses: list[AddressType] | None = None,
+    max_workers: int | None = None,
+    **search_topics: Any,
+) -> Iterator[RouteUpdate]:
+    """
+    Fetch ``AccessoryUpdated`` events between ``start_block`` and ``stop_block`` (inclusive),
+    emitted by any Purse unless ``addresses`` is given, matching ``search_topics``.
+
+    Block ranges are fetched concurrently (up to ``max_workers`` at once) and split when the
+    provider rejects them, streaming events in chain order (see ``LogBackfill``).
+    """
+    from .backfill import backfill_logs
+
+    yield from backfill_logs(
+        _route_update_filter(start_block, stop_block, addresses, search_topics),
+        max_workers=max_workers,
+        decode=decode_route_updates,
+    )
+
+
+def get_route_update_columns(
+    start_block: int,
+    stop_block: int,
+    addresses: list[AddressType] | None = None,
+    max_workers: int | None = None,
+    **search_topics: Any,
+) -> Iterator[dict[str, Any]]:
+    """
+    Same as ``get_route_updates``, but streams the events of each block range as NumPy
+    columns (see ``route_update_columns``), for bulk backfills. Requires ``numpy``.
+    """
+    from .backfill import backfill_logs
+
+    yield from backfill_logs(
+        _route_update_filter(start_block, stop_block, addresses, search_topics),
+        max_workers=max_workers,
+        decode=lambda logs: [route_update_columns(logs)],
+    )
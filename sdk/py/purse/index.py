@@ -0,0 +1,251 @@
+import sqlite3
+from pathlib import Path
+from threading import RLock
+from typing import TYPE_CHECKING, Iterable
+
+from ape.contracts import ContractContainer
+from ape.types import AddressType, HexBytes
+from ape.utils import ZERO_ADDRESS
+from eth_utils import to_hex
+
+from .checkpoint import default_checkpoint_path
+from .events import RouteUpdate, get_route_updates
+from .package import MANIFEST
+from .reorg import RouteIndexMixin
+
+if TYPE_CHECKING:
+    from ape.api import BlockAPI
+    from ape.types import ContractLog
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS routes (
+    purse TEXT NOT NULL,
+    selector TEXT NOT NULL,
+    accessory TEXT NOT NULL,
+    PRIMARY KEY (purse, selector)
+);
+-- NOTE: Was redundant with the primary key, so drop it from older databases
+DROP INDEX IF EXISTS routes_by_purse;
+CREATE INDEX IF NOT EXISTS routes_by_selector ON routes (selector);
+CREATE INDEX IF NOT EXISTS routes_by_accessory ON routes (accessory, selector);
+CREATE TABLE IF NOT EXISTS checkpoint (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    block_number INTEGER NOT NULL
+);
+"""
+
+
+class RoutingIndex(RouteIndexMixin):
+    """
+    Persistent, chain-wide index of the routing table of every Purse
+    (purse => method ID => accessory), fed by ``AccessoryUpdated`` events.
+
+    Defaults to a SQLite database in ape's data folder on live networks (or in memory on
+    local networks), so services can share one warm index instead of rescanning the chain.
+    """
+
+    def __init__(self, path: Path | str | None = None):
+        if path is None and (path := default_checkpoint_path("routing-index")):
+            path = path.with_suffix(".db")
+
+        if path is None:
+            path = ":memory:"
+
+        elif path != ":memory:":
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        # NOTE: Bot tasks share the connection, so each one writes in its own transaction
+        #       (re-entrant, as handling a reorg syncs again)
+        self._lock = RLock()
+
+        self._init_index()
+        self._last_indexed = self.last_indexed
+        # NOTE: The database only ever includes fully flushed blocks (see ``_flush``)
+        self._deltas.start = self._last_indexed + 1
+
+    @property
+    def last_indexed(self) -> int:
+        """Last block number applied to the index"""
+
+        row = self.db.execute("SELECT block_number FROM checkpoint").fetchone()
+        return row[0] if row else 0
+
+    def _set_last_indexed(self, block_number: int):
+        self._last_indexed = block_number
+        self.db.execute(
+            "INSERT OR REPLACE INTO checkpoint (id, block_number) VALUES (0, ?)",
+            (block_number,),
+        )
+
+    def _write_routes(self, routes: dict[tuple[AddressType, bytes], AddressType]):
+        self.db.executemany(
+            "DELETE FROM routes WHERE purse = ? AND selector = ?",
+            (
+                (purse, to_hex(method))
+                for (purse, method), accessory in routes.items()
+                if accessory == ZERO_ADDRESS
+            ),
+        )
+        self.db.executemany(
+            "INSERT OR REPLACE INTO routes (purse, selector, accessory) VALUES (?, ?, ?)",
+            (
+                (purse, to_hex(method), accessory)
+                for (purse, method), accessory in routes.items()
+                if accessory != ZERO_ADDRESS
+            ),
+        )
+
+    def _replay(self, updates: list[RouteUpdate]) -> list[tuple]:
+        # NOTE: Only the latest update of each (purse, method) has to be written, but each
+        #       update needs the route it replaced to be undone
+        routes: dict[tuple[AddressType, bytes], AddressType] = {}
+        undo = []
+
+        for update in updates:
+            key = (update.purse, update.method)
+
+            if key not in routes:
+                routes[key] = self.accessory_of(*key)
+
+            undo.append((key, routes[key]))
+            routes[key] = update.new_accessory
+
+        self._write_routes(routes)
+        return undo
+
+    def _undo(self, records: list[tuple]):
+        routes: dict[tuple[AddressType, bytes], AddressType] = {}
+
+        # NOTE: Records are newest first, so the oldest one wins
+        for key, accessory in records:
+            routes[key] = accessory
+
+        self._write_routes(routes)
+
+    def _mark_indexed(self, block_number: int):
+        if block_number > self._last_indexed:
+            self._set_last_indexed(block_number)
+
+    def _rollback(self, block_number: int):
+        super()._rollback(block_number)
+        self._set_last_indexed(self._last_indexed)
+
+    def apply(self, updates: Iterable[RouteUpdate], block_number: int | None = None):
+        """
+        Apply ``updates`` to the index in a single transaction, moving the checkpoint to
+        ``block_number`` (defaults to that of the last update).
+        """
+        updates = list(updates)
+        if block_number is None and updates:
+            block_number = max(update.block_number for update in updates)
+
+        with self._lock, self.db:
+            self._apply_route_updates(updates)
+
+            if block_number is not None:
+                self._mark_indexed(block_number)
+
+    def sync(self, stop_block: int | None = None) -> int:
+        """
+        Apply all ``AccessoryUpdated`` events emitted by any Purse after the checkpoint,
+        up to ``stop_block`` (defaults to the chain head).
+
+        Returns the number of events applied.
+        """
+        if stop_block is None:
+            stop_block = self.chain_manager.blocks.head.number
+
+        with self._lock:
+            if stop_block <= self._last_indexed:
+                return 0
+
+            updates = list(get_route_updates(self._last_indexed + 1, stop_block))
+            self.apply(updates, block_number=stop_block)
+            return len(updates)
+
+    def _update_from_log(self, log: "ContractLog"):
+        with self._lock, self.db:
+            super()._update_from_log(log)
+
+    def _check_head(self, block: "BlockAPI"):
+        with self._lock, self.db:
+            super()._check_head(block)
+
+    def purses_using(
+        self,
+        accessory: AddressType,
+        selector: bytes | str | None = None,
+    ) -> list[AddressType]:
+        """Purses routing any method (or only ``selector``, if given) to ``accessory``"""
+        accessory = self.conversion_manager.convert(accessory, AddressType)
+
+        if selector is None:
+            cursor = self.db.execute(
+                "SELECT DISTINCT purse FROM routes WHERE accessory = ?",
+                (accessory,),
+            )
+
+        else:
+            cursor = self.db.execute(
+                "SELECT purse FROM routes WHERE accessory = ? AND selector = ?",
+                (accessory, to_hex(HexBytes(selector))),
+            )
+
+        return [purse for (purse,) in cursor]
+
+    def accessory_of(self, purse: AddressType, selector: bytes | str) -> AddressType:
+        """Accessory handling ``selector`` for ``purse`` (``ZERO_ADDRESS`` if none)"""
+        purse = self.conversion_manager.convert(purse, AddressType)
+
+        row = self.db.execute(
+            "SELECT accessory FROM routes WHERE purse = ? AND selector = ?",
+            (purse, to_hex(HexBytes(selector))),
+        ).fetchone()
+        return row[0] if row else ZERO_ADDRESS
+
+    def accessories_of(self, purse: AddressType) -> dict[HexBytes, AddressType]:
+        """Routing table of ``purse``, as method ID => accessory"""
+        purse = self.conversion_manager.convert(purse, AddressType)
+
+        return {
+            HexBytes(selector): accessory
+            for selector, accessory in self.db.execute(
+                "SELECT selector, accessory FROM routes WHERE purse = ?",
+                (purse,),
+            )
+        }
+
+    def install(self, bot):
+        """
+        Dynamically maintain the index from the ``AccessoryUpdated`` events of all Purses.
+
+        Events are buffered, and the events of each block are written together (w/ the
+        checkpoint) once a later block is seen. Orphaned updates are undone after a reorg.
+        """
+        from silverback.types import TaskType
+
+        async def load_routing_index(snapshot):
+            self.sync()
+
+        load_routing_index.__name__ = f"purse:index:{load_routing_index.__name__}"
+        bot.broker_task_decorator(TaskType.STARTUP)(load_routing_index)
+
+        async def update_routing_index(log):
+            self._update_from_log(log)
+
+        update_routing_index.__name__ = f"purse:index:{update_routing_index.__name__}"
+        bot.broker_task_decorator(
+            TaskType.EVENT_LOG,
+            container=ContractContainer(MANIFEST.Purse).AccessoryUpdated,
+        )(update_routing_index)
+
+        async def flush_routing_index(block):
+            self._check_head(block)
+
+        flush_routing_index.__name__ = f"purse:index:{flush_routing_index.__name__}"
+        bot.broker_task_decorator(
+            TaskType.NEW_BLOCK, container=self.chain_manager.blocks
+        )(flush_routing_index)
@@ -1,4 +1,6 @@
-from typing import TYPE_CHECKING, Any
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
 
 # NOTE: Added to `typing` in 3.11+
 from typing_extensions import Self
@@ -6,24 +8,71 @@ from typing_extensions import Self
 from ape.contracts import (
     ContractInstance,
 )
-from ape.contracts.base import (
-    ContractCallHandler,
-    ContractEvent,
-    ContractEventWrapper,
-    ContractTransactionHandler,
-)
-from ape.utils import ManagerAccessMixin, cached_property, ZERO_ADDRESS
+from ape_ethereum import multicall
+from ape_ethereum.multicall.exceptions import UnsupportedChainError
+from ape.contracts.base import ContractEventWrapper
+from ape.exceptions import ProviderError
+from ape.utils import cached_property, ZERO_ADDRESS
 from ape.types import AddressType, ContractLog, HexBytes
+from eth_utils import to_checksum_address, to_hex
+from ethpm_types import ContractType
+from requests import HTTPError
 from .accessory import AccessoryMethod, Accessory
+from .checkpoint import save_checkpoint
+from .events import (
+    RouteUpdate,
+    decode_route_updates,
+    get_route_updates,
+    replay_routes,
+)
 from .package import MANIFEST
+from .planner import (
+    MAX_UPDATES,
+    batch_updates,
+    desired_routes,
+    plan_updates,
+    upgraded_routes,
+)
+from .reorg import RouteIndexMixin
+from .rpc import batch_request
+from .storage import get_accessories
 
 if TYPE_CHECKING:
     from ape.api import AccountAPI
     from ape.api.address import BaseAddress
     from ape.api.transactions import ReceiptAPI
 
+    from .aggregate import Aggregate
+    from .batch import Batch
+    from .sponsor import SponsorSigner
+
+
+# NOTE: Maximum number of distinct accessory sets to keep a merged contract type for
+COMPOSITE_CACHE_SIZE = 128
+
+
+@lru_cache(maxsize=COMPOSITE_CACHE_SIZE)
+def _composite_contract_type(
+    chain_id: int, accessories: frozenset[Accessory]
+) -> ContractType:
+    """
+    The Purse contract type extended with the ABIs of all ``accessories`` (on ``chain_id``,
+    as the same addresses may hold different contracts on other chains).
+
+    Shared between every Purse using the same set of accessories, so must not be modified.
+    """
+    abi = list(MANIFEST.Purse.abi)
+
+    # NOTE: Reuses the contract type each accessory already has (if loaded)
+    for accessory in sorted(accessories, key=lambda accy: accy.address):
+        abi.extend(accessory.contract.contract_type.abi)
+
+    return MANIFEST.Purse.model_copy(update={"abi": abi})
+
+
+class Purse(RouteIndexMixin):
+    _checkpoint_prefix = "purse"
 
-class Purse(ManagerAccessMixin):
     def __init__(
         self,
         account: "AccountAPI | BaseAddress | AddressType",
@@ -42,7 +91,7 @@ class Purse(ManagerAccessMixin):
         self._cached_accessories_by_method_id = {
             method.method: accy for accy in accessories for method in accy.methods
         }
-        self._last_indexed = 0
+        self._init_index()
 
     @classmethod
     def initialize(
@@ -52,14 +101,29 @@ class Purse(ManagerAccessMixin):
         singleton: ContractInstance | None = None,
     ) -> Self:
         assert singleton, "Needs support for package version"
+
+        # NOTE: Storage outlives delegation, so skip methods that are already routed
+        desired = desired_routes(*accessories)
+        current = get_accessories((account.address, method) for method in desired)
+        updates = plan_updates(
+            {method: address for (_, method), address in current.items()}, desired
+        )
+
+        # NOTE: Only the first batch fits in the delegation, the rest is sent afterwards
+        first, *rest = batch_updates(updates) or [[]]
         account.set_delegate(
             singleton,
             data=singleton.update_accessories.encode_input(
-                [method.model_dump() for accy in accessories for method in accy.methods]
+                [method.model_dump() for method in first]
             ),
         )
 
-        return cls(account, *accessories)
+        purse = cls(account, *accessories)
+
+        for batch in rest:
+            purse._send_updates(batch)
+
+        return purse
 
     @cached_property
     def wallet(self) -> "AccountAPI | None":
@@ -74,12 +138,12 @@ class Purse(ManagerAccessMixin):
 
     @cached_property
     def contract(self) -> ContractInstance:
-        contract_type = MANIFEST.Purse.model_copy(deep=True)
-
-        # NOTE: Re-initialize every time accessories change to update contract_type in cache
+        # NOTE: Re-initialized every time the set of accessories changes (see
+        #       `_update_cache_from_logs`), using the shared contract type for that set
         # TODO: Find some way to support diamond-like proxies in Ape?
-        for accy in self.accessories:
-            contract_type.abi.extend(accy.contract.contract_type.abi)
+        contract_type = _composite_contract_type(
+            self.chain_manager.chain_id, frozenset(self.accessories)
+        )
 
         # NOTE: Update local cache to avoid issues in parsing events
         self.chain_manager.contracts.contract_types[self.address] = contract_type
@@ -90,165 +154,465 @@ class Purse(ManagerAccessMixin):
         )
 
     def _update_cache_from_logs(self, *logs: "ContractLog"):
-        from purse.accessory import Accessory
-
-        for log in logs:
-            if (
-                log.contract_address == self.address
+        self._apply_route_updates(
+            [
+                RouteUpdate.from_log(log)
+                for log in logs
+                if log.contract_address == self.address
                 and log.event_name == "AccessoryUpdated"
-            ):
-                old = AccessoryMethod(method=log.method, accessory=log.old_accessory)
-                new = AccessoryMethod(method=log.method, accessory=log.new_accessory)
+            ]
+        )
+
+    def _replay(self, updates: list[RouteUpdate]) -> list[tuple[bytes, Any]]:
+        # NOTE: Updates are emitted by ``self``, so undo records are the previous routes
+        routes = self._routes
+        undo = []
+        for update in updates:
+            undo.append((update.method, routes.get(update.method)))
+            replay_routes([update], routes)
+
+        self._set_routes(routes)
+        return undo
+
+    def _undo(self, records: list[tuple[bytes, Any]]):
+        routes = self._routes
+        for method, accessory in records:
+            if accessory is None:
+                routes.pop(method, None)
+
+            else:
+                routes[method] = accessory
+
+        self._set_routes(routes)
+
+    @property
+    def _routes(self) -> dict[bytes, AddressType]:
+        return {
+            method: accy.address
+            for method, accy in self._cached_accessories_by_method_id.items()
+        }
 
-                if new.accessory != ZERO_ADDRESS:
-                    try:
-                        accessory = next(
-                            accy
-                            for accy in self.accessories
-                            if accy.address == new.accessory
-                        )
+    def _set_routes(self, routes: dict[bytes, AddressType]):
+        # NOTE: Only create accessories (and load their methods) that survive the replay
+        accessories = {accy.address: accy for accy in self.accessories}
+        for address in set(routes.values()) - accessories.keys():
+            accessories[address] = Accessory(address)
 
-                    except StopIteration:
-                        self.accessories.add(accessory := Accessory(new.accessory))
+        accessories_before = frozenset(self.accessories)
+        self._cached_accessories_by_method_id = {
+            method: accessories[address] for method, address in routes.items()
+        }
+        self.accessories = set(self._cached_accessories_by_method_id.values())
 
-                    self._cached_accessories_by_method_id[new.method] = accessory
+        if frozenset(self.accessories) != accessories_before:
+            # NOTE: Rebuild `.contract` and handler index on next access for new set
+            self.__dict__.pop("contract", None)
+            self.__dict__.pop("_handlers", None)
 
-                elif old.accessory != ZERO_ADDRESS:
-                    if old.method in self._cached_accessories_by_method_id:
-                        del self._cached_accessories_by_method_id[old.method]
+    def _dump_routes(self) -> dict:
+        return {to_hex(method): address for method, address in self._routes.items()}
 
-                    try:
-                        accessory = next(
-                            accy
-                            for accy in self.accessories
-                            if accy.address == old.accessory
-                        )
+    def _load_routes(self, routes: dict):
+        accessories: dict[AddressType, Accessory] = {}
+        self._cached_accessories_by_method_id = {
+            HexBytes(method): accessories.setdefault(address, Accessory(address))
+            for method, address in routes.items()
+        }
+        self.accessories = set(accessories.values())
 
-                    except StopIteration:
-                        continue
+        # NOTE: Rebuild `.contract` and handler index on next access for new set
+        self.__dict__.pop("contract", None)
+        self.__dict__.pop("_handlers", None)
 
-                    if all(
-                        method.method not in self._cached_accessories_by_method_id
-                        for method in accessory.methods
-                    ):
-                        self.accessories.remove(accessory)
+    def sync(
+        self,
+        checkpoint: Path | None = None,
+        stop_block: int | None = None,
+    ) -> int:
+        """
+        Apply all ``AccessoryUpdated`` logs emitted after the last indexed block, up to
+        ``stop_block`` (defaults to the chain head).
 
-                self._last_indexed = log.block.number
+        State is resumed from and saved to ``checkpoint``, which defaults to a file in
+        ape's data folder on live networks, so a restart only queries the newest logs.
+
+        Returns the number of logs applied.
+        """
+        self._resume(checkpoint)
+
+        if stop_block is None:
+            stop_block = self.chain_manager.blocks.head.number
+
+        if stop_block <= self._last_indexed:
+            return 0
+
+        updates = list(
+            get_route_updates(
+                self._last_indexed + 1, stop_block, addresses=[self.address]
+            )
+        )
+        self._apply_route_updates(updates)
+        self._mark_indexed(stop_block)
+
+        if self._checkpoint:
+            save_checkpoint(self._checkpoint, self._dump_state())
+
+        return len(updates)
+
+    def accessories_for(
+        self,
+        selectors: Iterable["str | bytes"],
+        from_storage: bool = False,
+    ) -> dict[HexBytes, AddressType]:
+        """
+        Read the accessory currently routed for every method ID in ``selectors``.
+
+        All selectors are resolved in a single round trip via an aggregated ``eth_call``
+        (using Multicall3), falling back to one call per selector on chains without it.
+        If ``from_storage`` is set, or if ``eth_call`` fails (e.g. it is throttled), the
+        routing table is read directly from account storage via ``eth_getStorageAt``.
+        """
+        selectors = list(dict.fromkeys(HexBytes(selector) for selector in selectors))
+
+        if not from_storage:
+            try:
+                return self._call_accessories_for(selectors)
+
+            except (ProviderError, HTTPError):
+                pass  # NOTE: Read them from storage instead
+
+        routes = get_accessories((self.address, selector) for selector in selectors)
+        return {selector: routes[self.address, selector] for selector in selectors}
+
+    def _call_accessories_for(
+        self, selectors: list[HexBytes]
+    ) -> dict[HexBytes, AddressType]:
+        if len(selectors) > 1:
+            try:
+                call = multicall.Call()
+                for selector in selectors:
+                    call.add(self.contract.accessoryByMethodId, selector)
+
+                return dict(zip(selectors, call()))
+
+            except UnsupportedChainError:
+                pass  # NOTE: No Multicall3 deployment, so fall back to batched calls
+
+        # NOTE: One `eth_call` per selector, but all sent in a single JSON-RPC batch
+        results = batch_request(
+            (
+                "eth_call",
+                [
+                    {
+                        "from": self.address,
+                        "to": self.address,
+                        "data": to_hex(
+                            self.contract.accessoryByMethodId.encode_input(selector)
+                        ),
+                    },
+                    "latest",
+                ],
+            )
+            for selector in selectors
+        )
+        return {
+            selector: to_checksum_address(HexBytes(result).rjust(32, b"\x00")[-20:])
+            for selector, result in zip(selectors, results)
+        }
 
     def has_accessory(self, accessory: "Accessory | AddressType") -> bool:
         from .accessory import Accessory
 
         if isinstance(accessory, Accessory):
-            return accessory in self._cached_accessories_by_method_id.values() or any(
-                self.contract.accessoryByMethodId(method.method) == accessory.address
-                for method in accessory.methods
+            return (
+                accessory in self._cached_accessories_by_method_id.values()
+                or accessory.address
+                in self.accessories_for(m.method for m in accessory.methods).values()
             )
 
         return self.has_accessory(Accessory(accessory))
 
-    def add_accessories(
+    def aggregate_calls(self) -> "Aggregate":
+        """
+        Record calls to make via the Aggregate accessory, which returns the result of every
+        call. Reads can be made using ``eth_call`` from this Purse.
+        """
+        from .aggregate import Aggregate
+
+        return Aggregate(self)
+
+    def sponsor_signer(
+        self,
+        signer: "AccountAPI | None" = None,
+        nonce: int | None = None,
+    ) -> "SponsorSigner":
+        """
+        Sign calls for relayers to make via the Sponsor accessory, on behalf of this Purse.
+        Uses ``signer`` (defaults to this Purse's wallet) and nonces starting at ``nonce``
+        (defaults to reading the current nonce from the Purse).
+        """
+        from .sponsor import SponsorSigner
+
+        return SponsorSigner(self, signer=signer, nonce=nonce)
+
+    def batch(self, gas_limit: int | None = None, **txn_args) -> "Batch":
+        """
+        Record calls and transfers to send using as few ``execute`` transactions (of the
+        Multicall accessory) as possible. Sent on ``.flush()``, or when used as a context
+        manager, on exit.
+        """
+        from .batch import Batch
+
+        return Batch(self, gas_limit=gas_limit, **txn_args)
+
+    def predict_create(self, nonce: int | None = None) -> AddressType:
+        """
+        Address of a ``create`` without salt (via the Create accessory) at account ``nonce``
+        (defaults to the next transaction, if sent by this Purse itself).
+        """
+        from .create import create_address
+
+        if nonce is None:
+            # NOTE: Sending a transaction increments the nonce before `CREATE` uses it
+            nonce = self.provider.get_nonce(self.address) + 1
+
+        return create_address(self.address, nonce)
+
+    def predict_create2(
+        self,
+        initcode_or_args: bytes = b"",
+        blueprint: Any = None,
+        salt: bytes = b"",
+    ) -> AddressType:
+        """
+        Address of a ``create`` with ``salt`` (via the Create accessory) of ``initcode`` (or
+        from ``blueprint`` with ``args``), computed offline apart from reading blueprint code.
+        """
+        from .create import create2_address
+
+        if not any(salt := HexBytes(salt)):
+            raise ValueError("Salt must be non-zero, or `create` doesn't use CREATE2")
+
+        return create2_address(
+            self.address, salt, self._create_initcode(initcode_or_args, blueprint)
+        )
+
+    def mine_salt(
+        self,
+        initcode_or_args: bytes = b"",
+        blueprint: Any = None,
+        prefix: str | None = None,
+        pattern: str | None = None,
+        **mine_args,
+    ) -> tuple[bytes, AddressType]:
+        """
+        Search for a salt to ``create`` (via the Create accessory) ``initcode`` (or from
+        ``blueprint`` with ``args``) at an address starting with ``prefix`` (or matching
+        ``pattern``), across all cores. See ``purse.create.mine_salt``.
+        """
+        from .create import mine_salt
+
+        return mine_salt(
+            self.address,
+            self._create_initcode(initcode_or_args, blueprint),
+            prefix=prefix,
+            pattern=pattern,
+            **mine_args,
+        )
+
+    def _create_initcode(self, initcode_or_args: bytes, blueprint: Any) -> bytes:
+        if (
+            blueprint is None
+            or (blueprint := self.conversion_manager.convert(blueprint, AddressType))
+            == ZERO_ADDRESS
+        ):
+            return bytes(initcode_or_args)
+
+        from .create import blueprint_initcode
+
+        return blueprint_initcode(
+            bytes(self.provider.get_code(blueprint)), bytes(initcode_or_args)
+        )
+
+    def plan(
         self,
         *accessories: "Accessory",
-        **txn_args,
-    ) -> "ReceiptAPI":
-        if not accessories:
-            raise RuntimeError("Must provide at least one accessory")
+        remove: Iterable["Accessory"] = (),
+    ) -> list[AccessoryMethod]:
+        """
+        Plan the updates to install ``accessories`` and uninstall ``remove``, skipping any
+        methods that are already routed correctly in the on-chain routing table.
+        """
+        desired = desired_routes(*accessories, remove=remove)
+        return plan_updates(self._read_routes(desired), desired)
+
+    def plan_upgrade(self) -> list[AccessoryMethod]:
+        """
+        Plan the updates to move every installed accessory to its latest version (as known
+        for this Purse version in ``ACCESSORIES``), skipping unchanged methods.
+        """
+        from .delegation import get_delegations
+        from .package import ACCESSORIES
+
+        if not (singleton := get_delegations([self.address])[self.address].purse):
+            raise RuntimeError(f"{self.address} is not delegated to a known Purse")
+
+        versions = ACCESSORIES.get(singleton, {})
+        accessories = {
+            address: Accessory(address)
+            for deployments in versions.values()
+            for address in deployments
+        }
+        current = self._read_routes(
+            m.method for accy in accessories.values() for m in accy.methods
+        )
+        return plan_updates(current, upgraded_routes(current, versions, accessories))
+
+    def _read_routes(self, selectors: Iterable[bytes]) -> dict[HexBytes, AddressType]:
+        current = self.accessories_for(selectors)
 
-        updates: list[dict] = [
-            method.model_dump() for accy in accessories for method in accy.methods
+        # NOTE: Cache what was just read from the routing table
+        routes = self._routes
+        for method, address in current.items():
+            if address == ZERO_ADDRESS:
+                routes.pop(method, None)
+
+            else:
+                routes[method] = address
+
+        self._set_routes(routes)
+        return current
+
+    def estimate_updates(self, updates: list[AccessoryMethod]) -> list[int]:
+        """Dry run ``updates``, returning the gas used by each transaction to apply them"""
+        return [
+            self.contract.update_accessories.estimate_gas_cost(
+                [method.model_dump() for method in batch],
+                sender=self.wallet or self.address,
+            )
+            for batch in batch_updates(updates)
+        ]
+
+    def update(
+        self,
+        updates: list[AccessoryMethod],
+        **txn_args,
+    ) -> list["ReceiptAPI"]:
+        """Apply ``updates`` using as few transactions as ``MAX_UPDATES`` allows"""
+        return [
+            self._send_updates(batch, **txn_args) for batch in batch_updates(updates)
         ]
 
+    def upgrade(self, **txn_args) -> list["ReceiptAPI"]:
+        """Move every installed accessory to its latest version"""
+        return self.update(self.plan_upgrade(), **txn_args)
+
+    def _send_updates(
+        self,
+        updates: list[AccessoryMethod],
+        **txn_args,
+    ) -> "ReceiptAPI":
+        if len(updates) > MAX_UPDATES:
+            raise ValueError(
+                f"Cannot apply more than {MAX_UPDATES} updates in one transaction,"
+                " use `Purse.update` instead"
+            )
+
         if "sender" not in txn_args and self.wallet:
             txn_args["sender"] = self.wallet
 
-        receipt = self.contract.update_accessories(updates, **txn_args)
+        receipt = self.contract.update_accessories(
+            [method.model_dump() for method in updates], **txn_args
+        )
 
-        self._update_cache_from_logs(*receipt.events)
+        # NOTE: Only decode our own `AccessoryUpdated` logs, not every event
+        self._apply_route_updates(
+            [
+                update
+                for update in decode_route_updates(receipt.logs)
+                if update.purse == self.address
+            ]
+        )
 
         return receipt
 
+    def add_accessories(
+        self,
+        *accessories: "Accessory",
+        **txn_args,
+    ) -> "ReceiptAPI | None":
+        """
+        Install ``accessories``, skipping methods that are already routed to them.
+        Returns ``None`` if there was nothing to update, or else the receipt of the last
+        transaction (if more than ``MAX_UPDATES`` methods need to be updated).
+        """
+        if not accessories:
+            raise RuntimeError("Must provide at least one accessory")
+
+        if updates := self.plan(*accessories):
+            return self.update(updates, **txn_args)[-1]
+
+        return None
+
     def remove_methods(
         self,
         *methods: "str | HexBytes",
         **txn_args,
-    ) -> "ReceiptAPI":
+    ) -> "ReceiptAPI | None":
+        """
+        Uninstall ``methods``, skipping methods that are not installed.
+        Returns ``None`` if there was nothing to update, or else the receipt of the last
+        transaction (if more than ``MAX_UPDATES`` methods need to be updated).
+        """
         if not methods:
             raise RuntimeError("Must provide at least one accessory method")
 
-        updates: list[dict] = [
-            AccessoryMethod(accessory=ZERO_ADDRESS, method=method).model_dump()
+        desired = {
+            AccessoryMethod.parse(method, ZERO_ADDRESS).method: ZERO_ADDRESS
             for method in methods
-        ]
-
-        if "sender" not in txn_args and self.wallet:
-            txn_args["sender"] = self.wallet
-
-        receipt = self.contract.update_accessories(updates, **txn_args)
+        }
 
-        self._update_cache_from_logs(*receipt.events)
+        if updates := plan_updates(self._read_routes(desired), desired):
+            return self.update(updates, **txn_args)[-1]
 
-        return receipt
+        return None
 
     def remove_accessories(
         self,
         *accessories: "Accessory",
         **txn_args,
-    ) -> "ReceiptAPI":
+    ) -> "ReceiptAPI | None":
         return self.remove_methods(
             *(m.method for accy in accessories for m in accy.methods),
             **txn_args,
         )
 
-    def __getattr__(self, name: str) -> Any:
-        if (attr := getattr(self.contract, name, None)) is not None:
-            return attr
-
-        # TODO: Create a better way to handle Diamond-style proxies
-        for accy in self.accessories:
-            match getattr(accy.contract, name, None):
-                case ContractEvent() as attr:
-                    self.contract.contract_type.abi.append(attr.abi)
-                    attr.contract = self.contract
-
-                    if name in self.contract._events_:
-                        self.contract._events_[name].append(attr)
-                    else:
-                        self.contract._events_[name] = [attr]
-
-                    return attr
-
-                case ContractEventWrapper() as attr:
-                    self.contract.contract_type.abi.extend(attr.abis)
-                    attr.contract = self.contract
-
-                    if name in self.contract._events_:
-                        self.contract._events_[name].append(attr)
-                    else:
-                        self.contract._events_[name] = [attr]
-
-                    return attr
-
-                case ContractCallHandler() as attr:
-                    self.contract.contract_type.abi.extend(attr.abis)
-                    attr.contract = self.contract
+    @cached_property
+    def _handlers(self) -> dict[str, Any]:
+        """Index of every method and event handler (incl. accessories) by name"""
+        contract = self.contract
 
-                    if name in self.contract._view_methods_:
-                        self.contract._view_methods_[name].append(attr)
-                    else:
-                        self.contract._view_methods_[name] = [attr]
+        handlers: dict[str, Any] = {
+            name: events[0] if len(events) == 1 else ContractEventWrapper(events)
+            for name, events in contract._events_.items()
+        }
+        # NOTE: Same precedence as `ContractInstance.__getattr__` (views, mutables, events)
+        handlers.update(contract._mutable_methods_)
+        handlers.update(contract._view_methods_)
 
-                    return attr
+        return handlers
 
-                case ContractTransactionHandler() as attr:
-                    self.contract.contract_type.abi.extend(attr.abis)
-                    attr.contract = self.contract
+    def __getattr__(self, name: str) -> Any:
+        # NOTE: Avoid infinite recursion if resolving our own attributes fails
+        if name.startswith("__") or name in ("contract", "_handlers"):
+            raise AttributeError(name)
 
-                    if name in self.contract._mutable_methods_:
-                        self.contract._mutable_methods_[name].append(attr)
-                    else:
-                        self.contract._mutable_methods_[name] = [attr]
+        # NOTE: `self.contract` includes the ABIs of all accessories (see `_handlers`)
+        if (handler := self._handlers.get(name)) is not None:
+            return handler
 
-                    return attr
+        elif (attr := getattr(self.contract, name, None)) is not None:
+            return attr
 
         raise AttributeError(
             f"Method {name} not a registered accessory method or event"
@@ -263,10 +627,7 @@ class Purse(ManagerAccessMixin):
         from silverback.types import TaskType
 
         async def load_purses_by_accessory(snapshot):
-            df = self.contract.AccessoryUpdated.query(
-                "method,old_accessory,new_accessory"
-            )
-            self._update_cache_from_logs(*df)
+            self.sync()
 
         load_purses_by_accessory.__name__ = (
             f"purse:main:{load_purses_by_accessory.__name__}"
@@ -274,9 +635,17 @@ class Purse(ManagerAccessMixin):
         bot.broker_task_decorator(TaskType.STARTUP)(load_purses_by_accessory)
 
         async def update_accessory(log):
-            self._update_cache_from_logs(log)
+            self._update_from_log(log)
 
         update_accessory.__name__ = f"purse:main:{update_accessory.__name__}"
         bot.broker_task_decorator(
-            TaskType.EVENT_LOG, container=self.contract_AccessoryUpdated
+            TaskType.EVENT_LOG, container=self.contract.AccessoryUpdated
         )(update_accessory)
+
+        async def check_reorg(block):
+            self._check_head(block)
+
+        check_reorg.__name__ = f"purse:main:{check_reorg.__name__}"
+        bot.broker_task_decorator(
+            TaskType.NEW_BLOCK, container=self.chain_manager.blocks
+        )(check_reorg)
@@ -1,14 +1,78 @@
+import json
+from functools import cached_property
 from importlib import resources
+from typing import TYPE_CHECKING, Any
 
-from ape.types import AddressType
-from ethpm_types import PackageManifest
+if TYPE_CHECKING:
+    from ape.types import AddressType
+    from ethpm_types import ContractType, PackageManifest
 
-MANIFEST = PackageManifest.model_validate_json(
-    resources.files(__package__).joinpath("manifest.json").read_text()
-)
+
+class LazyManifest:
+    """
+    The package manifest of this project, only loaded on first access and with each
+    contract type validated individually the first time it is used.
+
+    Any other attribute of ``PackageManifest`` is read from the fully validated manifest.
+    """
+
+    def __init__(self):
+        self._contract_types: dict[str, "ContractType"] = {}
+
+    @cached_property
+    def _raw_manifest(self) -> dict[str, Any]:
+        return json.loads(
+            resources.files(__package__).joinpath("manifest.json").read_text()
+        )
+
+    @cached_property
+    def _raw_contract_types(self) -> dict[str, Any]:
+        return self._raw_manifest.get("contractTypes", {})
+
+    @cached_property
+    def _manifest(self) -> "PackageManifest":
+        from ethpm_types import PackageManifest
+
+        return PackageManifest.model_validate(self._raw_manifest)
+
+    def get_contract_type(self, name: str) -> "ContractType | None":
+        if (contract_type := self._contract_types.get(name)) is not None:
+            return contract_type
+
+        elif (raw_contract_type := self._raw_contract_types.get(name)) is None:
+            return None
+
+        from ethpm_types import ContractType
+
+        contract_type = ContractType.model_validate(raw_contract_type)
+        return self._contract_types.setdefault(name, contract_type)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        elif (contract_type := self.get_contract_type(name)) is not None:
+            return contract_type
+
+        return getattr(self._manifest, name)
+
+
+MANIFEST = LazyManifest()
+
+# Contract name => storage variable => layout (from `vyper -f layout`)
+# NOTE: Compiler plugin does not include storage layouts in the manifest
+STORAGE_LAYOUT: dict[str, dict[str, dict]] = {
+    "Purse": {
+        "accessoryByMethodId": {
+            "type": "HashMap[bytes4, address]",
+            "n_slots": 1,
+            "slot": 0,
+        },
+    },
+}
 
 # codehash of Purse version => Purse singleton deployment address
-DEPLOYMENTS: dict[str, AddressType] = {
+DEPLOYMENTS: dict[str, "AddressType"] = {
     "c614b11e5f5e7d2201f54b65f0aae877b2d6c952f2e80b89cdd3fe23a0ea53ee": (
         "0xD2c583A9001e0d94536c6f57cA34fe975F318848"
     ),
@@ -19,7 +83,7 @@ DEPLOYMENTS: dict[str, AddressType] = {
 }
 
 # Accessory name => Purse delegate address => Accessory deployment address
-ACCESSORIES: dict[AddressType, dict[str, list[AddressType]]] = {
+ACCESSORIES: dict["AddressType", dict[str, list["AddressType"]]] = {
     "0xD2c583A9001e0d94536c6f57cA34fe975F318848": {
         "Multicall": [
             "0x0084b926D31e0E7FAD77a9f7E07eBa57015bcac8",
@@ -44,3 +108,96 @@ ACCESSORIES: dict[AddressType, dict[str, list[AddressType]]] = {
         ],
     },
 }
+
+
+# codehash of accessory runtime => (size of that runtime, method IDs to install)
+# NOTE: Generated from the code of each deployment in ``ACCESSORIES`` w/
+#       `python -m purse.package <network>` (add future versions below). Deployed code is
+#       only trusted if it starts w/ the runtime, as immutables (e.g. the EIP-712 domain
+#       of `Sponsor`) are appended to it and differ per chain.
+SELECTORS: dict[str, tuple[int, tuple[str, ...]]] = {
+    # NOTE: Multicall
+    "5dd8b86dcf672c6fe99deaae778db026760eab404f7b96318dea88c499a98073": (
+        446,
+        ("0x3f707e6b",),
+    ),
+    # NOTE: Create
+    "0d7c55ce25c60d85c4846928f5f08059ddcf7fa6a7ea26a9f696c9e9894aa472": (
+        1035,
+        ("0xefc81a8c", "0xcf5ba53f", "0xbc31bca9", "0xd015477a", "0x2646145d"),
+    ),
+    # NOTE: Flashloan
+    "0f340d55dd842f860e59acd2cd6cd584a77ad7d32f9ca52ee91282d43d1ad398": (
+        539,
+        ("0x23e30c8b",),
+    ),
+    # NOTE: Sponsor
+    "adb45b194ab612700c522bc053882ef48cbe2dcdeaaa5d78f78c6f324859d8a9": (
+        965,
+        ("0x92e45696", "0x53160a60"),
+    ),
+}
+
+
+def build_selector_table(
+    accessories: dict[str, list["AddressType"]] | None = None,
+) -> dict[str, tuple[int, tuple[str, ...]]]:
+    """
+    Generate ``SELECTORS`` from the code deployed on the connected network for every
+    deployment in ``accessories`` (defaults to all deployments in ``ACCESSORIES``).
+
+    Method IDs come from the manifest ABI only if the deployed code is the compiled runtime
+    (followed by its immutables), and are otherwise read from the dispatcher of the
+    deployed code.
+    """
+    from ape.utils import ManagerAccessMixin
+    from eth_utils import to_hex
+    from eth_utils.crypto import keccak
+    from ethpm_types.abi import MethodABI
+
+    from .bytecode import extract_selectors
+
+    if accessories is None:
+        accessories = {}
+        for deployments in ACCESSORIES.values():
+            for name, addresses in deployments.items():
+                accessories.setdefault(name, []).extend(addresses)
+
+    table = {}
+    for name, addresses in accessories.items():
+        contract_type = MANIFEST.get_contract_type(name)
+        runtime = (
+            bytes.fromhex(contract_type.runtime_bytecode.bytecode.removeprefix("0x"))
+            if contract_type and contract_type.runtime_bytecode
+            else None
+        )
+
+        for address in addresses:
+            if not (code := bytes(ManagerAccessMixin.provider.get_code(address))):
+                raise ValueError(f"No code deployed at {address}")
+
+            elif runtime and code.startswith(runtime):
+                code = runtime
+                methods = tuple(
+                    to_hex(keccak(text=abi.selector)[:4])
+                    for abi in contract_type.abi
+                    if isinstance(abi, MethodABI)
+                )
+
+            else:
+                # NOTE: Deployed from another version than the one in the manifest
+                methods = tuple(to_hex(method) for method in extract_selectors(code))
+
+            table[keccak(code).hex()] = (len(code), methods)
+
+    return table
+
+
+if __name__ == "__main__":
+    import sys
+    from pprint import pprint
+
+    from ape import networks
+
+    with networks.parse_network_choice(sys.argv[1] if len(sys.argv) > 1 else None):
+        pprint(build_selector_table(), sort_dicts=False)
@@ -0,0 +1,75 @@
+from typing import TYPE_CHECKING, Iterable, Mapping
+
+from ape.utils import ZERO_ADDRESS
+
+from .accessory import AccessoryMethod
+
+if TYPE_CHECKING:
+    from ape.types import AddressType
+
+    from .accessory import Accessory
+
+# NOTE: `Purse.update_accessories` accepts at most 100 updates per call
+MAX_UPDATES = 100
+
+
+def desired_routes(
+    *accessories: "Accessory",
+    remove: Iterable["Accessory"] = (),
+) -> dict[bytes, "AddressType"]:
+    """Routes after installing ``accessories`` and uninstalling ``remove``"""
+
+    routes = {m.method: ZERO_ADDRESS for accy in remove for m in accy.methods}
+    routes.update((m.method, m.accessory) for accy in accessories for m in accy.methods)
+    return routes
+
+
+def upgraded_routes(
+    current: Mapping[bytes, "AddressType"],
+    versions: Mapping[str, list["AddressType"]],
+    accessories: Mapping["AddressType", "Accessory"],
+) -> dict[bytes, "AddressType"]:
+    """
+    Routes after moving every installed accessory in ``versions`` (accessory name => list of
+    deployments, latest last) to its latest version, given the ``current`` routing table.
+    """
+    installed = set(current.values())
+    routes: dict[bytes, "AddressType"] = {}
+
+    for deployments in versions.values():
+        if not installed.intersection(deployments):
+            continue
+
+        *older, latest = deployments
+        for address in older:
+            # NOTE: Only clear methods still routed to the old version
+            routes.update(
+                (m.method, ZERO_ADDRESS)
+                for m in accessories[address].methods
+                if current.get(m.method) == address
+            )
+
+        routes.update((m.method, latest) for m in accessories[latest].methods)
+
+    return routes
+
+
+def plan_updates(
+    current: Mapping[bytes, "AddressType"],
+    desired: Mapping[bytes, "AddressType"],
+) -> list[AccessoryMethod]:
+    """Updates needed to move from ``current`` to ``desired`` routes, skipping unchanged"""
+
+    return [
+        AccessoryMethod(bytes(method), accessory)
+        for method, accessory in desired.items()
+        if current.get(method, ZERO_ADDRESS) != accessory
+    ]
+
+
+def batch_updates(updates: list[AccessoryMethod]) -> list[list[AccessoryMethod]]:
+    """Split ``updates`` into the fewest calls to ``update_accessories``"""
+
+    return [
+        updates[idx : idx + MAX_UPDATES] for idx in range(0, len(updates), MAX_UPDATES)
+    ]
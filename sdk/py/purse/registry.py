@@ -0,0 +1,274 @@
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from ape.contracts import ContractContainer
+from ape.types import AddressType, HexBytes
+from ape.utils import ManagerAccessMixin
+
+from .checkpoint import default_checkpoint_path, load_checkpoint, save_checkpoint
+from .events import RouteUpdate, get_route_updates
+from .main import Purse
+from .package import MANIFEST
+from .reorg import BlockDeltas
+
+if TYPE_CHECKING:
+    from ape.api import BlockAPI
+    from ape.api.address import BaseAddress
+    from ape.types import ContractLog
+
+
+class PurseRegistry(ManagerAccessMixin):
+    """
+    Maintains the routing table of every Purse in a fleet from a single chain-wide
+    ``AccessoryUpdated`` subscription, dispatching each event to its Purse by address.
+
+    Unlike installing every ``Purse`` in a bot, the number of tasks (and the cost of each
+    event) does not grow with the size of the fleet.
+
+    Usage example::
+
+        registry = PurseRegistry(*addresses)
+        registry.install(bot)
+
+        registry[address].accessories  # Kept up to date as blocks come in
+    """
+
+    def __init__(self, *purses: "Purse | BaseAddress | AddressType"):
+        self.purses: dict[AddressType, Purse] = {}
+        # NOTE: Updates of the latest block seen by the bot, which may not be complete yet
+        self._pending: list[RouteUpdate] = []
+        # NOTE: One checkpoint (and one reorg history) for the state of every Purse
+        self._checkpoint: Path | None = None
+        self._deltas = BlockDeltas()
+
+        for purse in purses:
+            self.add(purse)
+
+    def add(self, purse: "Purse | BaseAddress | AddressType") -> Purse:
+        """Track ``purse`` (if not tracked already), returning the tracked Purse"""
+        if not isinstance(purse, Purse):
+            purse = Purse(purse)
+
+        return self.purses.setdefault(purse.address, purse)
+
+    def remove(self, purse: "Purse | BaseAddress | AddressType"):
+        """Stop tracking ``purse``"""
+        address = self.conversion_manager.convert(
+            purse.address if isinstance(purse, Purse) else purse, AddressType
+        )
+        self.purses.pop(address, None)
+
+    def __getitem__(self, address: Any) -> Purse:
+        return self.purses[self.conversion_manager.convert(address, AddressType)]
+
+    def __contains__(self, address: Any) -> bool:
+        return self.conversion_manager.convert(address, AddressType) in self.purses
+
+    def __iter__(self) -> Iterator[Purse]:
+        return iter(self.purses.values())
+
+    def __len__(self) -> int:
+        return len(self.purses)
+
+    def apply(self, updates: Iterable[RouteUpdate]) -> list[Purse]:
+        """
+        Apply ``updates`` (from any Purse) to the tracked Purses, skipping updates of
+        untracked Purses or that a Purse has applied already.
+
+        Returns the Purses that were updated.
+        """
+        updates_by_purse: dict[AddressType, list[RouteUpdate]] = {}
+
+        for update in updates:
+            if update.purse in self.purses:
+                updates_by_purse.setdefault(update.purse, []).append(update)
+                self._deltas.record(
+                    update.block_number, update.block_hash, update.purse
+                )
+
+        updated = []
+        for address, purse_updates in updates_by_purse.items():
+            if (purse := self.purses[address])._apply_route_updates(purse_updates):
+                updated.append(purse)
+
+        return updated
+
+    def _resume(self, checkpoint: Path | None = None):
+        if checkpoint is not None:
+            self._checkpoint = checkpoint
+
+        elif self._checkpoint is None:
+            self._checkpoint = default_checkpoint_path("purse-registry")
+
+        if not self._checkpoint or not (state := load_checkpoint(self._checkpoint)):
+            return
+
+        for address, purse_state in state["purses"].items():
+            # NOTE: Purses that were indexed already (or are untracked) keep their state
+            if (purse := self.purses.get(address)) and purse._last_indexed == 0:
+                purse._load_state(purse_state)
+
+    def _save(self):
+        if self._checkpoint:
+            save_checkpoint(
+                self._checkpoint,
+                dict(
+                    purses={
+                        address: purse._dump_state()
+                        for address, purse in self.purses.items()
+                    }
+                ),
+            )
+
+    def sync(
+        self,
+        checkpoint: Path | None = None,
+        stop_block: int | None = None,
+    ) -> int:
+        """
+        Apply all ``AccessoryUpdated`` events emitted by any tracked Purse after the block
+        last indexed by all of them, up to ``stop_block`` (defaults to the chain head),
+        using one chain-wide query.
+
+        The state of every tracked Purse is resumed from and saved to one ``checkpoint``,
+        which defaults to a file in ape's data folder on live networks.
+
+        Returns the number of events applied.
+        """
+        self._resume(checkpoint)
+
+        if stop_block is None:
+            stop_block = self.chain_manager.blocks.head.number
+
+        start_block = min(
+            (purse._last_indexed for purse in self.purses.values()),
+            default=stop_block,
+        )
+        if stop_block <= start_block:
+            return 0
+
+        updates = [
+            update
+            for update in get_route_updates(start_block + 1, stop_block)
+            if update.purse in self.purses
+        ]
+        self.apply(updates)
+
+        for purse in self.purses.values():
+            purse._mark_indexed(stop_block)
+
+        self._save()
+        return len(updates)
+
+    def _flush(self, block_number: int):
+        """
+        Apply the pending updates of all blocks before ``block_number`` as one batch, and
+        advance the checkpoint to the last of those blocks (even if it had no updates).
+        """
+        if updates := [
+            update for update in self._pending if update.block_number < block_number
+        ]:
+            self._pending = [
+                update
+                for update in self._pending
+                if update.block_number >= block_number
+            ]
+            # NOTE: Events that arrive even later are still applied, as Purses re-apply
+            #       the blocks from theirs onwards in chain order
+            self.apply(updates)
+
+        elif not self.purses or all(
+            purse._last_indexed >= block_number - 1 for purse in self.purses.values()
+        ):
+            return
+
+        for purse in self.purses.values():
+            purse._mark_indexed(block_number - 1)
+
+        self._save()
+
+    def _handle_reorg(self) -> bool:
+        """
+        Undo the updates of orphaned blocks (if any) in the Purses that had any, and apply
+        the canonical updates from the fork onwards, returning whether there was a reorg.
+        """
+        if (fork_point := self._deltas.fork_point()) is None:
+            return False
+
+        orphaned = set(self._deltas.rollback(fork_point))
+        self._pending = [
+            update for update in self._pending if update.block_number < fork_point
+        ]
+        # NOTE: Other Purses have nothing to undo, and re-syncing from the fork onwards
+        #       applies any canonical updates they have there
+        for address in orphaned:
+            if purse := self.purses.get(address):
+                purse._rollback(fork_point)
+
+        self.sync()
+        return True
+
+    def _check_head(self, block: "BlockAPI"):
+        if not self._deltas.follows_head(block):
+            self._handle_reorg()
+
+    def _buffer_log(self, log: "ContractLog"):
+        if log.contract_address not in self.purses:
+            return
+
+        update = RouteUpdate.from_log(log)
+
+        if log.removed:
+            if update in self._pending:
+                # NOTE: Never applied, so there's nothing to undo
+                self._pending.remove(update)
+
+            else:
+                self._handle_reorg()
+
+            return
+
+        elif (
+            self._deltas.conflicts(
+                log.block_number, HexBytes(log.block_hash) if log.block_hash else None
+            )
+            and self._handle_reorg()
+        ):
+            return  # NOTE: Canonical updates (incl. ``log``) were re-applied
+
+        self._flush(log.block_number)
+        self._pending.append(update)
+
+    def install(self, bot):
+        """
+        Dynamically maintain the routing table of every tracked Purse, using one startup
+        task, one event task (for all Purses) and one block task.
+
+        Events are buffered, and the events of each block are applied together once a later
+        block (or an event from one) is seen. Orphaned updates are undone after a reorg.
+        """
+        from silverback.types import TaskType
+
+        async def load_purse_registry(snapshot):
+            self.sync()
+
+        load_purse_registry.__name__ = f"purse:registry:{load_purse_registry.__name__}"
+        bot.broker_task_decorator(TaskType.STARTUP)(load_purse_registry)
+
+        async def buffer_route_update(log):
+            self._buffer_log(log)
+
+        buffer_route_update.__name__ = f"purse:registry:{buffer_route_update.__name__}"
+        bot.broker_task_decorator(
+            TaskType.EVENT_LOG,
+            container=ContractContainer(MANIFEST.Purse).AccessoryUpdated,
+        )(buffer_route_update)
+
+        async def apply_route_updates(block):
+            self._check_head(block)
+            self._flush(block.number)
+
+        apply_route_updates.__name__ = f"purse:registry:{apply_route_updates.__name__}"
+        bot.broker_task_decorator(
+            TaskType.NEW_BLOCK, container=self.chain_manager.blocks
+        )(apply_route_updates)
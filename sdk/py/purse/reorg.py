@@ -0,0 +1,322 @@
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ape.exceptions import BlockNotFoundError
+from ape.logging import logger
+from ape.types import AddressType, HexBytes
+from ape.utils import ManagerAccessMixin
+
+from .checkpoint import default_checkpoint_path, load_checkpoint, save_checkpoint
+from .events import RouteUpdate
+
+if TYPE_CHECKING:
+    from ape.api import BlockAPI
+    from ape.types import ContractLog
+
+# NOTE: Number of most recent blocks whose updates can be undone after a reorg
+REORG_WINDOW = 128
+
+
+class BlockDeltas(ManagerAccessMixin):
+    """
+    Undo records of the updates applied to some state, keyed by the block (and block hash)
+    they came from, for the most recent ``window`` blocks.
+
+    After a reorg, only the orphaned blocks have to be undone and re-applied, instead of
+    rebuilding the state from all of history.
+    """
+
+    def __init__(self, window: int = REORG_WINDOW):
+        self.window = window
+        # NOTE: Kept in order of block number, as updates are applied in chain order
+        self.blocks: dict[int, tuple[HexBytes | None, list[Any]]] = {}
+        # NOTE: Every update applied from this block onwards has a record
+        self.start = 0
+        self.pruned = False
+        self._head: "tuple[int, HexBytes] | None" = None
+
+    def record(self, block_number: int, block_hash: HexBytes | None, undo: Any):
+        """Record ``undo`` (what to restore) for an update from ``block_number``"""
+        if block_number in self.blocks:
+            self.blocks[block_number][1].append(undo)
+
+        else:
+            self.blocks[block_number] = (block_hash, [undo])
+
+        while (oldest := next(iter(self.blocks))) <= block_number - self.window:
+            del self.blocks[oldest]
+            self.start = oldest + 1
+            self.pruned = True
+
+    def conflicts(self, block_number: int, block_hash: HexBytes | None) -> bool:
+        """Whether an update from ``block_number`` may mean recorded blocks were orphaned"""
+        if not self.blocks:
+            return False
+
+        elif block_number in self.blocks:
+            # NOTE: Unknown hashes (e.g. of updates from a receipt) can't be compared
+            recorded_hash = self.blocks[block_number][0]
+            return (
+                None not in (recorded_hash, block_hash) and recorded_hash != block_hash
+            )
+
+        # NOTE: An earlier block showing up again may be a redelivery, or a reorg
+        return block_number < next(reversed(self.blocks))
+
+    def follows_head(self, block: "BlockAPI") -> bool:
+        """Track the chain head, returning whether ``block`` directly extends the last one"""
+        head, self._head = self._head, (block.number, HexBytes(block.hash))
+
+        return head is None or (
+            block.number == head[0] + 1 and HexBytes(block.parent_hash) == head[1]
+        )
+
+    def fork_point(self) -> int | None:
+        """
+        Earliest recorded block that is no longer part of the chain (if any), checking
+        recorded blocks from the newest one, so the cost scales with the depth of a reorg.
+        """
+        fork_point = None
+
+        for block_number in reversed(self.blocks):
+            block_hash, _ = self.blocks[block_number]
+
+            try:
+                # NOTE: Blocks with an unknown hash are assumed to still be canonical
+                if (
+                    block_hash is None
+                    or self.chain_manager.blocks[block_number].hash == block_hash
+                ):
+                    break
+
+            except BlockNotFoundError:
+                pass  # NOTE: Chain is shorter than it was
+
+            fork_point = block_number
+
+        else:
+            if fork_point is not None and self.pruned:
+                logger.warning(
+                    f"Reorg may be deeper than the last {self.window} blocks,"
+                    " restart to rebuild state from scratch"
+                )
+
+        return fork_point
+
+    def rollback(self, block_number: int) -> list[Any]:
+        """
+        Forget every block from ``block_number`` onwards, returning their undo records in
+        the order to apply them (newest first).
+        """
+        undo = []
+
+        while self.blocks and (newest := next(reversed(self.blocks))) >= block_number:
+            undo.extend(reversed(self.blocks.pop(newest)[1]))
+
+        return undo
+
+
+class RouteIndexMixin(ManagerAccessMixin):
+    """
+    Incrementally maintained state built from ``AccessoryUpdated`` logs, which can be
+    resumed from a checkpoint and rolled back block by block after a reorg.
+
+    Subclasses apply updates in ``_replay`` (returning a record to undo each one), restore
+    those records in ``_undo``, and (de)serialize their state w/ ``_dump_routes`` and
+    ``_load_routes``.
+    """
+
+    address: AddressType
+    # NOTE: Prefix of the default checkpoint file name
+    _checkpoint_prefix: str
+
+    def _init_index(self):
+        # NOTE: Every log up to (and incl.) this block has been applied
+        self._last_indexed = 0
+        # NOTE: Position (block number, log index) of the last log that was applied
+        self._last_applied: tuple[int, int] = (0, -1)
+        self._checkpoint: Path | None = None
+        self._deltas = BlockDeltas()
+        # NOTE: Logs from blocks that are not complete yet (see ``_flush``)
+        self._pending: list[RouteUpdate] = []
+
+    def _replay(self, updates: list[RouteUpdate]) -> list[Any]:
+        raise NotImplementedError
+
+    def _undo(self, records: list[Any]):
+        raise NotImplementedError
+
+    def _dump_routes(self) -> dict:
+        raise NotImplementedError
+
+    def _load_routes(self, routes: dict):
+        raise NotImplementedError
+
+    def _is_applied(self, update: RouteUpdate) -> bool:
+        # NOTE: Updates older than the recorded history came w/ the loaded state
+        if update.block_number < self._deltas.start:
+            return True
+
+        _, records = self._deltas.blocks.get(update.block_number, (None, []))
+        return any(applied == update for applied, _ in records)
+
+    def _apply_route_updates(self, updates: list[RouteUpdate]) -> int:
+        """
+        Apply ``updates`` (in any order), skipping those that were applied already, and
+        return how many were applied.
+
+        Updates at or before the last applied log (e.g. delivered late by a different
+        subscription) undo every block from theirs onwards, which are then re-applied
+        together in chain order.
+        """
+        if not (
+            updates := sorted(
+                {update for update in updates if not self._is_applied(update)},
+                key=lambda update: (update.block_number, update.log_index),
+            )
+        ):
+            return 0
+
+        applied = len(updates)
+
+        if ((first := updates[0]).block_number, first.log_index) <= self._last_applied:
+            undone = self._deltas.rollback(first.block_number)
+            self._undo([undo for _, undo in undone])
+            updates = sorted(
+                {*updates, *(update for update, _ in undone)},
+                key=lambda update: (update.block_number, update.log_index),
+            )
+
+        for update, undo in zip(updates, self._replay(updates)):
+            self._deltas.record(update.block_number, update.block_hash, (update, undo))
+
+        last = updates[-1]
+        self._last_applied = max(
+            self._last_applied, (last.block_number, last.log_index)
+        )
+        return applied
+
+    def _mark_indexed(self, block_number: int):
+        """Record that every log up to (and incl.) ``block_number`` has been applied"""
+        self._last_indexed = max(self._last_indexed, block_number)
+
+    def _rollback(self, block_number: int):
+        """Undo all updates applied from ``block_number`` onwards"""
+        self._undo([undo for _, undo in self._deltas.rollback(block_number)])
+        self._pending = [
+            update for update in self._pending if update.block_number < block_number
+        ]
+        self._last_indexed = min(self._last_indexed, block_number - 1)
+        self._last_applied = min(self._last_applied, (block_number, -1))
+
+    def _handle_reorg(self) -> bool:
+        """
+        Undo the updates of orphaned blocks (if any) and apply the canonical updates from
+        the fork onwards, returning whether there was a reorg.
+        """
+        if (fork_point := self._deltas.fork_point()) is None:
+            return False
+
+        self._rollback(fork_point)
+        self.sync()
+        return True
+
+    def _check_head(self, block: "BlockAPI"):
+        if not self._deltas.follows_head(block):
+            self._handle_reorg()
+
+        self._flush(block.number)
+
+    def _flush(self, block_number: int):
+        """
+        Apply the buffered logs of every block before ``block_number`` at once (in chain
+        order), and checkpoint the state up to the last of those blocks.
+        """
+        if ready := [
+            update for update in self._pending if update.block_number < block_number
+        ]:
+            self._pending = [
+                update
+                for update in self._pending
+                if update.block_number >= block_number
+            ]
+            self._apply_route_updates(ready)
+
+        if block_number - 1 > self._last_indexed:
+            self._mark_indexed(block_number - 1)
+
+            if self._checkpoint:
+                save_checkpoint(self._checkpoint, self._dump_state())
+
+    def _update_from_log(self, log: "ContractLog"):
+        block_hash = HexBytes(log.block_hash) if log.block_hash else None
+
+        # NOTE: Canonical updates are re-applied (incl. ``log``) after a reorg
+        if (
+            log.removed or self._deltas.conflicts(log.block_number, block_hash)
+        ) and self._handle_reorg():
+            return
+
+        update = RouteUpdate.from_log(log)
+
+        if log.removed:
+            # NOTE: Never applied, or already undone
+            if update in self._pending:
+                self._pending.remove(update)
+
+            return
+
+        # NOTE: Logs of the same block can arrive out of order (e.g. from different
+        #       subscriptions), so they are only applied once a later block shows up
+        self._flush(log.block_number)
+
+        if log.block_number > self._last_indexed:
+            self._pending.append(update)
+
+        elif not self._is_applied(update):
+            # NOTE: Late log of a block that was already flushed
+            self._apply_route_updates([update])
+
+            if self._checkpoint:
+                save_checkpoint(self._checkpoint, self._dump_state())
+
+    def _dump_state(self) -> dict:
+        return dict(
+            last_indexed=self._last_indexed,
+            last_applied=list(self._last_applied),
+            routes=self._dump_routes(),
+        )
+
+    def _load_state(self, state: dict):
+        self._load_routes(state["routes"])
+        self._last_indexed = state["last_indexed"]
+        # NOTE: Older checkpoints only have the last (fully) indexed block
+        self._last_applied = tuple(
+            state.get("last_applied", (self._last_indexed + 1, -1))
+        )
+        # NOTE: Loaded state has no history of its own to undo, and only ever includes
+        #       fully flushed blocks
+        self._deltas = BlockDeltas()
+        self._deltas.start = self._last_indexed + 1
+
+    def _resume(self, checkpoint: Path | None = None):
+        """Set the checkpoint file, loading its state if nothing was indexed yet"""
+        if checkpoint is not None:
+            self._checkpoint = checkpoint
+
+        elif self._checkpoint is None:
+            self._checkpoint = default_checkpoint_path(
+                f"{self._checkpoint_prefix}-{self.address}"
+            )
+
+        if (
+            self._last_indexed == 0
+            and self._checkpoint
+            and (state := load_checkpoint(self._checkpoint))
+        ):
+            self._load_state(state)
+
+    def sync(
+        self, checkpoint: Path | None = None, stop_block: int | None = None
+    ) -> int:
+        raise NotImplementedError
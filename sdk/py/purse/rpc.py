@@ -0,0 +1,41 @@
+from typing import Any, Iterable
+
+from ape.exceptions import ProviderError
+from ape.utils import ManagerAccessMixin
+
+# NOTE: Most providers cap the number of requests accepted in a single JSON-RPC batch
+MAX_BATCH_SIZE = 100
+
+
+def batch_request(requests: Iterable[tuple[str, list]]) -> list[Any]:
+    """
+    Send ``requests`` (pairs of RPC method and parameters) as JSON-RPC batches,
+    returning their results in the same order as ``requests``.
+
+    Falls back to sending each request individually if the provider can't batch them.
+    """
+    provider = ManagerAccessMixin.provider
+    requests = list(requests)
+    results: list[Any] = []
+
+    for idx in range(0, len(requests), MAX_BATCH_SIZE):
+        batch = requests[idx : idx + MAX_BATCH_SIZE]
+
+        try:
+            responses = provider.web3.provider.make_batch_request(batch)
+
+        except (AttributeError, NotImplementedError):
+            results.extend(provider.make_request(rpc, params) for rpc, params in batch)
+            continue
+
+        if not isinstance(responses, list):
+            # NOTE: Some providers reject the entire batch with a single error object
+            raise ProviderError(str(responses.get("error", responses)))
+
+        for response in responses:
+            if "error" in response:
+                raise ProviderError(str(response["error"]))
+
+            results.append(response["result"])
+
+    return results
@@ -0,0 +1,403 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache, cached_property
+from typing import TYPE_CHECKING, Any, Iterable, NamedTuple
+
+from ape.contracts import ContractInstance
+from ape.types import AddressType, HexBytes
+from ape.utils import ManagerAccessMixin
+from eth_abi import encode
+from eth_keys.datatypes import PrivateKey
+from eth_utils.crypto import keccak
+
+from .package import MANIFEST
+
+if TYPE_CHECKING:
+    from ape.api import AccountAPI
+
+    from .main import Purse
+
+DOMAIN_TYPEHASH = keccak(
+    text="EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)"
+)
+SPONSOR_TYPEHASH = keccak(
+    text="Sponsor(address target,bytes data,uint256 amount,uint256 deadline,uint256 nonce)"
+)
+SPONSOR_BATCH_TYPEHASH = keccak(
+    text=(
+        "SponsorBatch(Call[] calls,uint256 deadline,uint256 nonce)"
+        "Call(address target,bytes data,uint256 amount)"
+    )
+)
+CALL_TYPEHASH = keccak(text="Call(address target,bytes data,uint256 amount)")
+# NOTE: Must match `MAX_BATCH_SIZE` in `Sponsor.vy`
+MAX_BATCH_SIZE = 32
+# NOTE: Must match `eip712_domain_separator.__init__` in `Sponsor.vy`
+DOMAIN_NAME = "Sponsor"
+DOMAIN_VERSION = "1"
+
+# NOTE: Minimum number of messages per worker process to be worth the startup cost
+MIN_MESSAGES_PER_PROCESS = 256
+
+
+def domain_separator(chain_id: int, purse: AddressType) -> bytes:
+    """EIP-712 domain separator of the Sponsor accessory, when installed in ``purse``"""
+
+    return keccak(
+        encode(
+            ["bytes32", "bytes32", "bytes32", "uint256", "address"],
+            [
+                DOMAIN_TYPEHASH,
+                keccak(text=DOMAIN_NAME),
+                keccak(text=DOMAIN_VERSION),
+                chain_id,
+                purse,
+            ],
+        )
+    )
+
+
+def struct_hash(
+    target: AddressType,
+    data: bytes,
+    amount: int,
+    deadline: int,
+    nonce: int,
+) -> bytes:
+    """EIP-712 struct hash of a ``Sponsor`` message"""
+
+    return keccak(
+        encode(
+            ["bytes32", "address", "bytes32", "uint256", "uint256", "uint256"],
+            [SPONSOR_TYPEHASH, target, keccak(data), amount, deadline, nonce],
+        )
+    )
+
+
+def batch_struct_hash(
+    calls: list[tuple[AddressType, bytes, int]],
+    deadline: int,
+    nonce: int,
+) -> bytes:
+    """EIP-712 struct hash of a ``SponsorBatch`` message over ``(target, data, amount)``"""
+
+    call_hashes = b"".join(
+        keccak(
+            encode(
+                ["bytes32", "address", "bytes32", "uint256"],
+                [CALL_TYPEHASH, target, keccak(data), amount],
+            )
+        )
+        for target, data, amount in calls
+    )
+    return keccak(
+        encode(
+            ["bytes32", "bytes32", "uint256", "uint256"],
+            [SPONSOR_BATCH_TYPEHASH, keccak(call_hashes), deadline, nonce],
+        )
+    )
+
+
+def _sign_digests(
+    private_key: bytes, digests: list[bytes]
+) -> list[tuple[int, bytes, bytes]]:
+    key = PrivateKey(private_key)
+    signatures = []
+
+    for digest in digests:
+        signature = key.sign_msg_hash(digest)
+        signatures.append(
+            (
+                signature.v + 27,
+                signature.r.to_bytes(32, "big"),
+                signature.s.to_bytes(32, "big"),
+            )
+        )
+
+    return signatures
+
+
+@cache
+def _method_id(name: str) -> bytes:
+    return keccak(text=MANIFEST.Sponsor.mutable_methods[name].selector)[:4]
+
+
+class SponsoredCall(NamedTuple):
+    target: AddressType
+    data: bytes
+    amount: int
+    deadline: int
+    nonce: int
+    v: int
+    r: bytes
+    s: bytes
+
+    @property
+    def args(self) -> tuple:
+        """Arguments to ``Sponsor.sponsor``"""
+        return (
+            self.target,
+            self.data,
+            self.amount,
+            self.deadline,
+            self.v,
+            self.r,
+            self.s,
+        )
+
+    @property
+    def calldata(self) -> HexBytes:
+        """Calldata to relay to the Purse"""
+        return HexBytes(
+            _method_id("sponsor")
+            + encode(
+                [
+                    "address",
+                    "bytes",
+                    "uint256",
+                    "uint256",
+                    "uint8",
+                    "bytes32",
+                    "bytes32",
+                ],
+                self.args,
+            )
+        )
+
+
+class SponsoredBatch(NamedTuple):
+    calls: list[tuple[AddressType, bytes, int]]
+    deadline: int
+    nonce: int
+    v: int
+    r: bytes
+    s: bytes
+
+    @property
+    def args(self) -> tuple:
+        """Arguments to ``Sponsor.sponsor_batch``"""
+        return (
+            [
+                dict(target=target, data=data, amount=amount)
+                for target, data, amount in self.calls
+            ],
+            self.deadline,
+            self.v,
+            self.r,
+            self.s,
+        )
+
+    @property
+    def calldata(self) -> HexBytes:
+        """Calldata to relay to the Purse"""
+        return HexBytes(
+            _method_id("sponsor_batch")
+            + encode(
+                ["(address,bytes,uint256)[]", "uint256", "uint8", "bytes32", "bytes32"],
+                [self.calls, self.deadline, self.v, self.r, self.s],
+            )
+        )
+
+
+class SponsorSigner(ManagerAccessMixin):
+    """
+    Signs ``Sponsor`` messages for a Purse in bulk, handing out sequential nonces starting
+    from the Purse's ``sponsor_nonce``, which is only read once.
+
+    Usage example::
+
+        signer = purse.sponsor_signer()
+        calls = signer.sign_many(
+            [(token.address, token.transfer.encode_input(receiver, amount), 0), ...],
+            deadline=deadline,
+        )
+        # Relay each call, in order of nonce
+        relayer.transfer(purse.address, 0, data=calls[0].calldata)
+    """
+
+    def __init__(
+        self,
+        purse: "Purse",
+        signer: "AccountAPI | None" = None,
+        nonce: int | None = None,
+        chain_id: int | None = None,
+    ):
+        self.purse = purse
+
+        if not (signer := signer or purse.wallet):
+            raise ValueError("Must provide a signer for the Purse")
+
+        self.signer = signer
+        self.chain_id = (
+            chain_id if chain_id is not None else self.chain_manager.chain_id
+        )
+        self.nonce = nonce if nonce is not None else self._read_nonce()
+
+    def _read_nonce(self) -> int:
+        # NOTE: Not cached, so the Purse's own contract type is not overwritten
+        return ContractInstance(self.purse.address, MANIFEST.Sponsor).sponsor_nonce()
+
+    @cached_property
+    def domain_separator(self) -> bytes:
+        return domain_separator(self.chain_id, self.purse.address)
+
+    def digest(
+        self,
+        target: AddressType,
+        data: bytes,
+        amount: int,
+        deadline: int,
+        nonce: int,
+    ) -> bytes:
+        return keccak(
+            b"\x19\x01"
+            + self.domain_separator
+            + struct_hash(target, data, amount, deadline, nonce)
+        )
+
+    def sign(
+        self,
+        target: Any,
+        data: bytes = b"",
+        amount: Any = 0,
+        deadline: int = 2**256 - 1,
+    ) -> SponsoredCall:
+        """Sign a call to ``target``, using the next nonce"""
+        return self.sign_many([(target, data, amount)], deadline=deadline)[0]
+
+    def sign_many(
+        self,
+        calls: Iterable[tuple[Any, bytes, Any]],
+        deadline: int = 2**256 - 1,
+        max_workers: int | None = None,
+    ) -> list[SponsoredCall]:
+        """
+        Sign every ``(target, data, amount)`` in ``calls``, using sequential nonces.
+
+        If the signer's private key is available (e.g. test accounts), large batches are
+        signed in parallel using a process pool, otherwise each message is signed by the
+        signer one by one.
+        """
+        messages = [
+            (*call, deadline, self.nonce + idx)
+            for idx, call in enumerate(self._convert_calls(calls))
+        ]
+        signatures = self._sign(
+            [self.digest(*message) for message in messages], max_workers=max_workers
+        )
+
+        self.nonce += len(messages)
+        return [
+            SponsoredCall(*message, *signature)
+            for message, signature in zip(messages, signatures)
+        ]
+
+    def batch_digest(
+        self,
+        calls: list[tuple[AddressType, bytes, int]],
+        deadline: int,
+        nonce: int,
+    ) -> bytes:
+        return keccak(
+            b"\x19\x01"
+            + self.domain_separator
+            + batch_struct_hash(calls, deadline, nonce)
+        )
+
+    def sign_batches(
+        self,
+        calls: Iterable[tuple[Any, bytes, Any]],
+        deadline: int = 2**256 - 1,
+        batch_size: int = MAX_BATCH_SIZE,
+        max_workers: int | None = None,
+    ) -> list[SponsoredBatch]:
+        """
+        Split every ``(target, data, amount)`` in ``calls`` into batches of ``batch_size``
+        calls, signing each batch (using sequential nonces) to be relayed via one
+        ``sponsor_batch`` call.
+        """
+        if not 0 < batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"Batch size must be between 1 and {MAX_BATCH_SIZE}")
+
+        calls = self._convert_calls(calls)
+        batches = [
+            (calls[idx : idx + batch_size], deadline, self.nonce + nonce)
+            for nonce, idx in enumerate(range(0, len(calls), batch_size))
+        ]
+        signatures = self._sign(
+            [self.batch_digest(*batch) for batch in batches], max_workers=max_workers
+        )
+
+        self.nonce += len(batches)
+        return [
+            SponsoredBatch(*batch, *signature)
+            for batch, signature in zip(batches, signatures)
+        ]
+
+    def sign_batch(
+        self,
+        calls: Iterable[tuple[Any, bytes, Any]],
+        deadline: int = 2**256 - 1,
+    ) -> SponsoredBatch:
+        """Sign all ``(target, data, amount)`` in ``calls`` as one batch, using one nonce"""
+        calls = list(calls)
+        if not 0 < len(calls) <= MAX_BATCH_SIZE:
+            raise ValueError(f"Batch must have between 1 and {MAX_BATCH_SIZE} calls")
+
+        return self.sign_batches(calls, deadline=deadline)[0]
+
+    def _convert_calls(
+        self, calls: Iterable[tuple[Any, bytes, Any]]
+    ) -> list[tuple[AddressType, bytes, int]]:
+        return [
+            (
+                self.conversion_manager.convert(target, AddressType),
+                bytes(data),
+                self.conversion_manager.convert(amount, int),
+            )
+            for target, data, amount in calls
+        ]
+
+    def _sign(
+        self,
+        digests: list[bytes],
+        max_workers: int | None = None,
+    ) -> list[tuple[int, bytes, bytes]]:
+        if private_key := getattr(self.signer, "private_key", None):
+            return self._sign_digests(
+                HexBytes(private_key), digests, max_workers=max_workers
+            )
+
+        signatures = []
+        for digest in digests:
+            if not (signature := self.signer.sign_raw_msghash(HexBytes(digest))):
+                raise ValueError("Signer refused to sign message")
+
+            signatures.append((signature.v, signature.r, signature.s))
+
+        return signatures
+
+    def _sign_digests(
+        self,
+        private_key: bytes,
+        digests: list[bytes],
+        max_workers: int | None = None,
+    ) -> list[tuple[int, bytes, bytes]]:
+        if len(digests) < 2 * MIN_MESSAGES_PER_PROCESS or max_workers == 1:
+            return _sign_digests(private_key, digests)
+
+        max_workers = max_workers or os.cpu_count() or 1
+        chunk_size = max(MIN_MESSAGES_PER_PROCESS, -(-len(digests) // max_workers))
+        chunks = [
+            digests[idx : idx + chunk_size]
+            for idx in range(0, len(digests), chunk_size)
+        ]
+
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            return [
+                signature
+                for signatures in executor.map(
+                    _sign_digests, [private_key] * len(chunks), chunks
+                )
+                for signature in signatures
+            ]
@@ -0,0 +1,55 @@
+from typing import TYPE_CHECKING, Iterable
+
+from ape.types import AddressType, HexBytes
+from ape.utils import ManagerAccessMixin
+from eth_utils import to_checksum_address, to_hex
+from eth_utils.crypto import keccak
+
+from .package import STORAGE_LAYOUT
+from .rpc import batch_request
+
+if TYPE_CHECKING:
+    from ape.types import BlockID
+
+
+def accessory_slot(method: bytes) -> int:
+    """Storage slot of ``Purse.accessoryByMethodId[method]`` in a Purse-enabled account"""
+
+    # NOTE: Vyper stores `HashMap` entries at `keccak256(slot ++ key)`, and `bytes4` keys
+    #       occupy a left-aligned (right zero-padded) 32 byte word
+    base_slot = STORAGE_LAYOUT["Purse"]["accessoryByMethodId"]["slot"]
+    return int.from_bytes(
+        keccak(base_slot.to_bytes(32, "big") + bytes(method).ljust(32, b"\x00")),
+        "big",
+    )
+
+
+def get_accessories(
+    routes: Iterable[tuple["AddressType", bytes]],
+    block_id: "BlockID" = "latest",
+) -> dict[tuple[AddressType, HexBytes], AddressType]:
+    """
+    Read ``accessoryByMethodId`` for every ``(purse, method)`` pair in ``routes`` directly
+    from account storage, using batched ``eth_getStorageAt`` requests.
+    """
+    routes = list(
+        dict.fromkeys(
+            (
+                ManagerAccessMixin.conversion_manager.convert(purse, AddressType),
+                HexBytes(method),
+            )
+            for purse, method in routes
+        )
+    )
+    if not isinstance(block_id, str):
+        block_id = to_hex(block_id)
+
+    results = batch_request(
+        ("eth_getStorageAt", [purse, to_hex(accessory_slot(method)), block_id])
+        for purse, method in routes
+    )
+
+    return {
+        route: to_checksum_address(HexBytes(value).rjust(32, b"\x00")[-20:])
+        for route, value in zip(routes, results)
+    }
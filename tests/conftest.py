@@ -1,6 +1,8 @@
 import pytest
+from ape.types import ContractLog
 
 from purse import Accessory, Purse
+from purse.events import RouteUpdate
 
 
 @pytest.fixture(scope="session")
@@ -34,6 +36,11 @@ def multicall(project, owner):
     return Accessory(owner.deploy(project.Multicall))
 
 
+@pytest.fixture(scope="session")
+def aggregate(project, owner):
+    return Accessory(owner.deploy(project.Aggregate))
+
+
 @pytest.fixture(scope="session")
 def sponsor(project, owner):
     return Accessory(owner.deploy(project.Sponsor))
@@ -51,3 +58,26 @@ def __default__():
     """
     container = compilers.compile_source("vyper", SRC, contractName="Dummy")
     return Accessory(container.deploy(sender=owner))
+
+
+@pytest.fixture(scope="session")
+def as_log():
+    # NOTE: Build the log a bot would receive for ``update``
+    def convert(update: RouteUpdate, removed: bool = False) -> ContractLog:
+        return ContractLog(
+            event_name="AccessoryUpdated",
+            contract_address=update.purse,
+            event_arguments=dict(
+                method=update.method,
+                old_accessory=update.old_accessory,
+                new_accessory=update.new_accessory,
+            ),
+            transaction_hash=update.log_index.to_bytes(32, "big"),
+            block_number=update.block_number,
+            block_hash=update.block_hash,
+            log_index=update.log_index,
+            transaction_index=0,
+            removed=removed,
+        )
+
+    return convert
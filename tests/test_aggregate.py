@@ -0,0 +1,62 @@
+import ape
+import pytest
+from ape.exceptions import DecodingError
+from ape.utils import ZERO_ADDRESS
+
+from purse import Purse
+
+
+@pytest.fixture()
+def purse(singleton, owner, aggregate):
+    return Purse.initialize(owner, aggregate, singleton=singleton)
+
+
+def test_aggregate_reads(purse, singleton, aggregate, other):
+    calls = purse.aggregate_calls()
+    for method in aggregate.methods:
+        calls.add(singleton.accessoryByMethodId, method.method)
+
+    # NOTE: Can only update accessories from the purse
+    calls.add(singleton.update_accessories, [], allow_failure=True)
+    calls.add_raw(other, b"")
+    # NOTE: More calls than fit in one `aggregate` call
+    for _ in range(150):
+        calls.add(singleton.accessoryByMethodId, b"\x00" * 4)
+
+    assert calls() == [
+        *([(True, ZERO_ADDRESS)] * len(aggregate.methods)),
+        (False, None),
+        (True, b""),
+        *([(True, ZERO_ADDRESS)] * 150),
+    ]
+
+
+def test_aggregate_truncated_result(purse, dummy, owner):
+    # NOTE: Returndata of each call is truncated to 512 bytes
+    owner.transfer(dummy.address, 0, data=b"\x01" * 2048)
+    calls = purse.aggregate_calls().add(dummy.contract.last_call, allow_failure=True)
+
+    assert calls() == [(False, None)]
+
+    with pytest.raises(DecodingError):
+        purse.aggregate_calls().add(dummy.contract.last_call)()
+
+
+def test_aggregate_reverts(purse, singleton):
+    calls = purse.aggregate_calls().add(singleton.update_accessories, [])
+
+    with ape.reverts(message="Purse:!authorized"):
+        calls.transact()
+
+
+def test_aggregate_transact(purse, singleton, other):
+    balance = other.balance
+    calls = (
+        purse.aggregate_calls()
+        .add(singleton.update_accessories, [], allow_failure=True)
+        .add_raw(other, b"", value="1 ether")
+    )
+
+    (receipt,) = calls.transact()
+    assert not receipt.failed
+    assert other.balance - balance == ape.convert("1 ether", int)
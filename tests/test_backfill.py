@@ -0,0 +1,118 @@
+import pytest
+from ape.exceptions import ProviderError
+from ape.types import LogFilter
+
+from purse.backfill import DEFAULT_RANGE, LogBackfill, is_range_error
+from purse.package import MANIFEST
+
+
+class FlakyBackfill(LogBackfill):
+    """Rejects ranges of more than 2 blocks, and fails every range once"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests: list[tuple[int, int]] = []
+
+    def _request(self, start_block, stop_block):
+        self.requests.append((start_block, stop_block))
+
+        if stop_block - start_block > 1:
+            raise ProviderError("query exceeds max block range 2")
+
+        elif self.requests.count((start_block, stop_block)) == 1:
+            raise ProviderError("connection reset")
+
+        return list(range(start_block, stop_block + 1))
+
+
+@pytest.fixture()
+def log_filter(purse):
+    return LogFilter.from_event(
+        MANIFEST.Purse.events["AccessoryUpdated"],
+        addresses=[purse.address],
+        start_block=0,
+        stop_block=20,
+    )
+
+
+def test_backfill_splits_and_retries(log_filter):
+    backfill = FlakyBackfill(log_filter, chunk_size=8, max_workers=3, backoff=0)
+
+    assert list(backfill) == list(range(0, 21))
+    assert backfill.chunk_size == 2
+
+
+class ShrinkingBackfill(LogBackfill):
+    """Rejects ranges of more than 2 blocks, until 3 requests were made"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests: list[tuple[int, int]] = []
+
+    def _request(self, start_block, stop_block):
+        self.requests.append((start_block, stop_block))
+
+        if len(self.requests) <= 3 and stop_block - start_block > 1:
+            raise ProviderError("query returned more than 10000 results")
+
+        return list(range(start_block, stop_block + 1))
+
+
+def test_backfill_grows_range_again(log_filter):
+    log_filter = log_filter.model_copy(update=dict(stop_block=100))
+    backfill = ShrinkingBackfill(log_filter, chunk_size=8, max_workers=1, backoff=0)
+
+    assert list(backfill) == list(range(0, 101))
+    # NOTE: Full size ranges are fetched again once smaller ranges keep succeeding
+    assert backfill.chunk_size == 8
+    assert any(stop - start == 7 for start, stop in backfill.requests[1:])
+
+
+def test_backfill_chunk_size(log_filter, networks):
+    page_size = networks.provider.block_page_size
+
+    # NOTE: Only ranges decoded by `get_contract_logs` are capped at the page size
+    assert LogBackfill(log_filter, chunk_size=10 * page_size).chunk_size == page_size
+    assert (
+        LogBackfill(log_filter, chunk_size=10 * page_size, decode=list).chunk_size
+        == 10 * page_size
+    )
+    assert LogBackfill(log_filter, decode=list).chunk_size == DEFAULT_RANGE
+
+
+@pytest.mark.parametrize(
+    "message,splits",
+    [
+        ("query exceeds max block range 2000", True),
+        ("query returned more than 10000 results", True),
+        ("Log response size exceeded", True),
+        ("429 Client Error: Too Many Requests", False),
+        ("project ID request rate exceeded", False),
+        ("daily request count limited to 100000", False),
+    ],
+)
+def test_is_range_error(message, splits):
+    assert is_range_error(ProviderError(message)) == splits
+
+
+def test_backfill_gives_up(log_filter):
+    backfill = FlakyBackfill(log_filter, chunk_size=2, max_retries=0, backoff=0)
+
+    with pytest.raises(ProviderError, match="connection reset"):
+        list(backfill)
+
+
+def test_backfill_matches_query(chain, purse, dummy, multicall):
+    purse.add_accessories(dummy, sender=purse.wallet)
+    purse.add_accessories(multicall, sender=purse.wallet)
+    purse.remove_accessories(dummy, sender=purse.wallet)
+    log_filter = LogFilter.from_event(
+        MANIFEST.Purse.events["AccessoryUpdated"],
+        addresses=[purse.address],
+        start_block=0,
+        stop_block=chain.blocks.head.number,
+    )
+
+    assert list(LogBackfill(log_filter, chunk_size=1, max_workers=4)) == list(
+        purse.contract.AccessoryUpdated.range(0, chain.blocks.head.number + 1)
+    )
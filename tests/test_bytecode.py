@@ -0,0 +1,27 @@
+import pytest
+from ape.types import HexBytes
+from eth_utils.crypto import keccak
+from ethpm_types.abi import MethodABI
+
+from purse.bytecode import extract_selectors, get_selectors
+
+
+@pytest.mark.parametrize(
+    "name", ["Purse", "Create", "Flashloan", "Multicall", "Sponsor"]
+)
+def test_extract_selectors(project, name):
+    contract_type = project.get_contract(name).contract_type
+    runtime_code = HexBytes(contract_type.runtime_bytecode.bytecode)
+
+    assert set(extract_selectors(runtime_code)) == {
+        HexBytes(keccak(text=abi.selector)[:4])
+        for abi in contract_type.abi
+        if isinstance(abi, MethodABI)
+    }
+
+
+def test_get_selectors(multicall, sponsor):
+    assert get_selectors([multicall.address, sponsor.address]) == {
+        accessory.address: tuple(m.method for m in accessory.methods)
+        for accessory in (multicall, sponsor)
+    }
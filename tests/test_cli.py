@@ -0,0 +1,27 @@
+import json
+
+from click.testing import CliRunner
+
+from purse.__main__ import cli
+
+
+def test_audit(purse, other):
+    result = CliRunner().invoke(
+        cli,
+        ["audit", "--network", "ethereum:local:test"],
+        input=f"{purse.address}\n{other.address}\n\nnot-an-address\n",
+    )
+
+    assert result.exit_code == 0, result.output
+    delegated, undelegated, invalid = map(json.loads, result.output.splitlines())
+
+    assert delegated["address"] == purse.address
+    assert delegated["purse"] is not None
+    # NOTE: Known accessories are not deployed on the local network
+    assert delegated["accessories"] == {}
+
+    assert undelegated["address"] == other.address
+    assert undelegated["delegate"] is None
+
+    assert invalid["address"] == "not-an-address"
+    assert "error" in invalid
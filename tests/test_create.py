@@ -29,6 +29,11 @@ def test_create_blueprint(purse, blueprint, salt):
     assert tx.events == [
         purse.DeploymentFromBlueprint(blueprint=blueprint, salt=salt, args=b""),
     ]
+    assert tx.events[0].deployment == (
+        purse.predict_create2(b"", blueprint, salt)
+        if any(salt)
+        else purse.predict_create(purse.wallet.nonce - 1)
+    )
 
 
 @pytest.mark.parametrize("salt", [b"", b"Custom Salt"])
@@ -43,3 +48,37 @@ def test_raw_create(purse, container, salt):
     assert tx.events == [
         purse.Deployment(salt=salt, initcode=initcode),
     ]
+    assert tx.events[0].deployment == (
+        purse.predict_create2(initcode, ZERO_ADDRESS, salt)
+        if any(salt)
+        else purse.predict_create(purse.wallet.nonce - 1)
+    )
+
+
+def test_predict_create(purse, container):
+    initcode = container.contract_type.get_deployment_bytecode()
+    predicted = purse.predict_create()
+
+    tx = purse.create(initcode, sender=purse.wallet)
+
+    assert tx.events[0].deployment == predicted
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_mine_salt(purse, blueprint, max_workers):
+    salt, address = purse.mine_salt(
+        b"", blueprint, prefix="0xa", max_workers=max_workers, batch_size=16
+    )
+
+    assert address.lower().startswith("0xa")
+
+    tx = purse.create(b"", blueprint, salt, sender=purse.wallet)
+
+    assert tx.events[0].deployment == address
+
+
+def test_mine_salt_gives_up(purse, container):
+    initcode = container.contract_type.get_deployment_bytecode()
+
+    with pytest.raises(ValueError, match="No salt found"):
+        purse.mine_salt(initcode, pattern="^0{40}$", max_workers=1, max_attempts=10)
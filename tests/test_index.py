@@ -0,0 +1,75 @@
+from ape.utils import ZERO_ADDRESS
+
+from purse import RoutingIndex
+from purse.events import RouteUpdate
+
+PURSE_A = "0xABaBaBaBABabABabAbAbABAbABabababaBaBABaB"
+PURSE_B = "0xCdCDCdCdcdcdcdCdcDcDCdcDcDCdCdcdCdcDCDcD"
+ACCESSORY_X = "0xeFEfeFEfeFeFEFEFEfefeFeFefEfEfEfeFEFEFEf"
+ACCESSORY_Y = "0xFafafAfafAFaFAFaFafafafAfaFaFAfAfAfAFaFA"
+METHOD = bytes.fromhex("12345678")
+
+
+def test_routing_index(tmp_path):
+    path = tmp_path / "routes.sqlite"
+    index = RoutingIndex(path)
+    index.apply(
+        [
+            RouteUpdate(PURSE_A, METHOD, ZERO_ADDRESS, ACCESSORY_X, 1, 0),
+            RouteUpdate(PURSE_B, METHOD, ZERO_ADDRESS, ACCESSORY_X, 1, 1),
+            RouteUpdate(PURSE_A, METHOD, ACCESSORY_X, ACCESSORY_Y, 2, 0),
+            RouteUpdate(PURSE_B, METHOD, ACCESSORY_X, ZERO_ADDRESS, 3, 0),
+        ]
+    )
+
+    assert index.last_indexed == 3
+    assert index.purses_using(ACCESSORY_X) == []
+    assert index.purses_using(ACCESSORY_Y, METHOD) == [PURSE_A]
+    assert index.purses_using(ACCESSORY_Y.lower(), METHOD) == [PURSE_A]
+    assert index.accessory_of(PURSE_A, "0x12345678") == ACCESSORY_Y
+    assert index.accessory_of(PURSE_B, METHOD) == ZERO_ADDRESS
+    assert index.accessories_of(PURSE_A) == {METHOD: ACCESSORY_Y}
+    assert index.accessories_of(PURSE_A.lower()) == {METHOD: ACCESSORY_Y}
+    assert index.accessory_of(PURSE_A.lower(), METHOD) == ACCESSORY_Y
+
+    # NOTE: State is persisted, at exactly the given path
+    assert path.is_file()
+    assert RoutingIndex(path).accessories_of(PURSE_A) == {METHOD: ACCESSORY_Y}
+
+
+def test_routing_index_reorg(chain, as_log):
+    index = RoutingIndex()
+    head = chain.blocks.head.number
+    index.apply([], block_number=head)
+
+    # NOTE: Updates from blocks that are no longer part of the chain
+    install, replace, other = (
+        RouteUpdate(
+            PURSE_A, METHOD, ZERO_ADDRESS, ACCESSORY_X, head + 1, 0, b"\x01" * 32
+        ),
+        RouteUpdate(
+            PURSE_A, METHOD, ACCESSORY_X, ACCESSORY_Y, head + 1, 1, b"\x01" * 32
+        ),
+        RouteUpdate(
+            PURSE_B, METHOD, ZERO_ADDRESS, ACCESSORY_X, head + 2, 0, b"\x02" * 32
+        ),
+    )
+
+    # NOTE: Logs are only written (w/ the checkpoint) once their block is complete
+    index._update_from_log(as_log(replace))
+    index._update_from_log(as_log(install))
+    assert index.accessory_of(PURSE_A, METHOD) == ZERO_ADDRESS
+    assert index.last_indexed == head
+
+    index._update_from_log(as_log(other))
+    assert index.accessory_of(PURSE_A, METHOD) == ACCESSORY_Y
+    assert index.accessories_of(PURSE_B) == {}
+    assert index.last_indexed == head + 1
+
+    # NOTE: Removed logs undo their block (and drop later pending ones)
+    index._update_from_log(as_log(install, removed=True))
+    assert index.accessory_of(PURSE_A, METHOD) == ZERO_ADDRESS
+    assert index.last_indexed == head
+
+    index._check_head(chain.blocks.head)
+    assert index.accessories_of(PURSE_B) == {}
@@ -1,5 +1,6 @@
 import ape
 import pytest
+from ape.exceptions import VirtualMachineError
 
 from purse import Purse
 
@@ -51,3 +52,60 @@ def test_only_owner_can_multicall(purse, other):
             [dict(target=other, value="1 ether", data=b"")],
             sender=other,
         )
+
+
+def test_batch(purse, accounts, dummy):
+    a, b = accounts[1:3]
+    bal_a = a.balance
+    bal_b = b.balance
+
+    with purse.batch() as batch:
+        for _ in range(150):
+            batch.transfer(a, 1)
+
+        batch.add(dummy.contract.last_call)
+        batch.transfer(b, "1 ether")
+
+    assert a.balance - bal_a == 150
+    assert b.balance - bal_b == ape.convert("1 ether", int)
+    # NOTE: Split by the maximum number of calls per `execute`
+    assert len(batch.receipts) == 152
+    assert len({receipt.txn_hash for receipt in batch.receipts}) == 2
+    assert batch.receipts[0] is batch.receipts[99]
+    assert batch.receipts[100] is batch.receipts[-1]
+
+
+def test_batch_partial_failure(purse, accounts):
+    a, b = accounts[1:3]
+
+    batch = purse.batch()
+    for _ in range(100):
+        batch.transfer(a, 1)
+
+    # NOTE: The second `execute` reverts, as the Purse can't afford this transfer
+    batch.transfer(b, purse.balance + 1)
+
+    with pytest.raises(VirtualMachineError):
+        batch.flush()
+
+    # NOTE: Calls sent before the failure keep their receipts, and the rest can be retried
+    assert len(batch.receipts) == 100
+    assert len({receipt.txn_hash for receipt in batch.receipts}) == 1
+    assert len(batch.calls) == 1
+
+
+def test_batch_gas_limit(purse, accounts):
+    batch = purse.batch()
+    for account in accounts[1:5]:
+        batch.add_raw(account, b"\x01" * 2048)
+
+    with pytest.raises(ValueError):
+        batch.add_raw(accounts[1], b"\x01" * 2049)
+
+    gas = purse.execute.estimate_gas_cost(batch.calls, sender=purse.wallet)
+    batch.gas_limit = gas - 1
+    receipts = batch.flush()
+
+    assert len(receipts) == 4
+    assert len({receipt.txn_hash for receipt in receipts}) > 1
+    assert batch.calls == []
@@ -0,0 +1,83 @@
+import pytest
+from ape.types import HexBytes
+from ape.utils import ZERO_ADDRESS
+from eth_utils import keccak, to_hex
+
+from purse import Accessory
+from purse.accessory import AccessoryMethod
+from purse.bytecode import known_selectors
+from purse.package import MANIFEST, SELECTORS, build_selector_table
+
+
+def test_known_accessory_methods(multicall):
+    code = bytes(multicall.contract.code)
+    methods = (HexBytes("0x3f707e6b"),)
+
+    assert known_selectors(code) == methods
+    # NOTE: Immutables are appended to the runtime
+    assert known_selectors(code + b"\x00" * 32) == methods
+    assert known_selectors(code[:-1]) is None
+    assert [m.method for m in Accessory(multicall.address).methods] == list(methods)
+
+    # NOTE: Known deployments are not trusted by address alone (none of them have code on
+    #       the local network)
+    assert Accessory("0x9FF116bCc5AEdaa4fC7b81b9a476Bc351A260CcE").methods == []
+
+
+def test_selector_table_matches_manifest(
+    multicall, create2_deployer, sponsor, aggregate
+):
+    table = build_selector_table(
+        {
+            "Multicall": [multicall.address],
+            "Create": [create2_deployer.address],
+            "Sponsor": [sponsor.address],
+        }
+    )
+
+    for name, accessory in (
+        ("Multicall", multicall),
+        ("Create", create2_deployer),
+        ("Sponsor", sponsor),
+    ):
+        runtime = HexBytes(getattr(MANIFEST, name).runtime_bytecode.bytecode)
+        size, methods = table[keccak(runtime).hex()]
+        assert size == len(runtime)
+        assert [HexBytes(method) for method in methods] == [
+            m.method for m in accessory.methods
+        ]
+
+        # NOTE: Entries for the runtimes in the current manifest must agree w/ the generator
+        if entry := SELECTORS.get(keccak(runtime).hex()):
+            assert entry == (size, methods)
+
+    # NOTE: Code of another version is never assumed to have the methods in the manifest
+    code = aggregate.contract.code
+    size, methods = build_selector_table({"Multicall": [aggregate.address]})[
+        keccak(code).hex()
+    ]
+    assert size == len(code)
+    assert [HexBytes(method) for method in methods] == [
+        m.method for m in aggregate.methods
+    ]
+
+
+def test_lazy_manifest():
+    assert MANIFEST.Purse is MANIFEST.get_contract_type("Purse")
+    # NOTE: Anything else is read from the full manifest
+    assert MANIFEST.contract_types["Purse"].abi == MANIFEST.Purse.abi
+
+    with pytest.raises(AttributeError):
+        MANIFEST.NotAContract
+
+
+def test_parse_accessory_method():
+    method_id = keccak(text="execute((address,uint256,bytes)[])")[:4]
+
+    for method in (
+        "execute((address,uint256,bytes)[])",
+        to_hex(method_id),
+        to_hex(method_id)[2:],
+        HexBytes(method_id),
+    ):
+        assert AccessoryMethod.parse(method, ZERO_ADDRESS) == (method_id, ZERO_ADDRESS)
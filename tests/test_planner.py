@@ -0,0 +1,41 @@
+from ape.utils import ZERO_ADDRESS
+
+from purse import Accessory
+from purse.accessory import AccessoryMethod
+from purse.planner import MAX_UPDATES, batch_updates, plan_updates, upgraded_routes
+
+
+def test_upgraded_routes(project, owner, multicall, create2_deployer):
+    # NOTE: Two deployments of the Multicall accessory, sharing the same method
+    old_multicall = multicall.address
+    new_multicall = owner.deploy(project.Multicall).address
+    create = create2_deployer.address
+    accessories = {
+        address: Accessory(address)
+        for address in (old_multicall, new_multicall, create)
+    }
+    versions = {"Multicall": [old_multicall, new_multicall], "Create": [create]}
+    (method,) = (m.method for m in accessories[old_multicall].methods)
+    current = {method: old_multicall}
+
+    # NOTE: Accessories that aren't installed are not added
+    desired = upgraded_routes(current, versions, accessories)
+    assert desired == {method: new_multicall}
+    assert plan_updates(current, desired) == [AccessoryMethod(method, new_multicall)]
+
+    # NOTE: Nothing to do once upgraded
+    assert plan_updates(desired, upgraded_routes(desired, versions, accessories)) == []
+
+
+def test_batch_updates():
+    updates = [
+        AccessoryMethod(idx.to_bytes(4, "big"), ZERO_ADDRESS)
+        for idx in range(2 * MAX_UPDATES + 1)
+    ]
+
+    assert [len(batch) for batch in batch_updates(updates)] == [
+        MAX_UPDATES,
+        MAX_UPDATES,
+        1,
+    ]
+    assert batch_updates([]) == []
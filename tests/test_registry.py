@@ -0,0 +1,165 @@
+import pytest
+from ape.utils import ZERO_ADDRESS
+
+from purse import Purse, PurseRegistry
+from purse.events import RouteUpdate
+
+
+def test_registry_sync(chain, singleton, owner, accounts, multicall, dummy):
+    if chain.provider.name == "test":
+        pytest.skip("EthereumTester can't query logs without an address filter")
+
+    purse = Purse.initialize(owner, multicall, singleton=singleton)
+    untracked = Purse.initialize(accounts[1], dummy, singleton=singleton)
+    registry = PurseRegistry(owner.address)
+
+    assert registry.sync() > 0
+    assert owner in registry
+    assert untracked.address not in registry
+    assert registry[owner].accessories == {multicall}
+
+    purse.add_accessories(dummy, sender=owner)
+    untracked.remove_accessories(dummy, sender=accounts[1])
+    registry.sync()
+
+    assert registry[owner].accessories == {multicall, dummy}
+
+
+def test_registry_apply(owner, multicall, dummy):
+    registry = PurseRegistry(owner.address)
+    method = next(iter(dummy.methods)).method
+    updates = [
+        RouteUpdate(owner.address, method, ZERO_ADDRESS, multicall.address, 1, 0),
+        RouteUpdate(ZERO_ADDRESS, method, ZERO_ADDRESS, dummy.address, 1, 1),
+        RouteUpdate(owner.address, method, multicall.address, dummy.address, 2, 0),
+    ]
+
+    assert registry.apply(updates) == [registry[owner]]
+    assert registry[owner]._routes == {method: dummy.address}
+
+    # NOTE: Updates that were applied already are skipped
+    assert registry.apply(updates) == []
+    assert registry[owner]._routes == {method: dummy.address}
+
+
+def test_registry_applies_each_block_at_once(owner, multicall, dummy):
+    registry = PurseRegistry(owner.address)
+    method = next(iter(dummy.methods)).method
+    registry._pending = [
+        RouteUpdate(owner.address, method, ZERO_ADDRESS, multicall.address, 1, 0),
+        RouteUpdate(owner.address, method, multicall.address, dummy.address, 1, 1),
+    ]
+
+    # NOTE: Block 1 may still have more events
+    registry._flush(1)
+    assert registry[owner]._routes == {}
+
+    registry._flush(2)
+    assert registry._pending == []
+    assert registry[owner]._routes == {method: dummy.address}
+    assert registry[owner]._last_applied == (1, 1)
+
+
+def test_registry_checkpoints_empty_blocks(owner, other, tmp_path):
+    registry = PurseRegistry(owner.address, other.address)
+    registry._checkpoint = tmp_path / "registry.json"
+
+    # NOTE: Blocks w/o any updates still move the checkpoint, so they're not rescanned
+    registry._flush(5)
+    assert [purse._last_indexed for purse in registry] == [4, 4]
+
+    restarted = PurseRegistry(owner.address, other.address)
+    restarted._resume(registry._checkpoint)
+    assert [purse._last_indexed for purse in restarted] == [4, 4]
+
+
+def test_registry_late_log(chain, owner, multicall, dummy, as_log):
+    registry = PurseRegistry(owner.address)
+    method, other_method = [m.method for m in multicall.methods + dummy.methods][:2]
+    block_1, block_2 = chain.blocks[1].hash, chain.blocks[2].hash
+
+    registry._buffer_log(
+        as_log(
+            RouteUpdate(
+                owner.address, method, ZERO_ADDRESS, multicall.address, 1, 0, block_1
+            )
+        )
+    )
+    registry._buffer_log(
+        as_log(
+            RouteUpdate(
+                owner.address, method, multicall.address, dummy.address, 2, 0, block_2
+            )
+        )
+    )
+    assert registry[owner]._routes == {method: multicall.address}
+
+    # NOTE: Block 1 was applied already, but this event of it arrives after block 2
+    registry._buffer_log(
+        as_log(
+            RouteUpdate(
+                owner.address,
+                other_method,
+                ZERO_ADDRESS,
+                dummy.address,
+                1,
+                1,
+                block_1,
+            )
+        )
+    )
+    registry._flush(3)
+
+    assert registry._pending == []
+    assert registry[owner]._routes == {
+        method: dummy.address,
+        other_method: dummy.address,
+    }
+
+
+def test_registry_reorg(chain, owner, multicall, dummy, as_log):
+    registry = PurseRegistry(owner.address)
+    method = next(iter(dummy.methods)).method
+    head = chain.blocks.head
+    registry[owner]._mark_indexed(head.number)
+
+    # NOTE: Updates from blocks that are no longer part of the chain
+    install, replace = (
+        RouteUpdate(
+            owner.address,
+            method,
+            ZERO_ADDRESS,
+            multicall.address,
+            head.number + 1,
+            0,
+            b"\x01" * 32,
+        ),
+        RouteUpdate(
+            owner.address,
+            method,
+            multicall.address,
+            dummy.address,
+            head.number + 2,
+            0,
+            b"\x02" * 32,
+        ),
+    )
+
+    for removed in (install, replace):
+        registry.apply([install, replace])
+        assert registry[owner]._routes == {method: dummy.address}
+
+        registry._buffer_log(as_log(removed, removed=True))
+        assert registry[owner]._routes == {}
+        assert registry[owner]._last_indexed == head.number
+
+    # NOTE: A new head that doesn't extend the last one also rolls back orphaned blocks
+    registry.apply([install, replace])
+    registry._check_head(head)
+    registry._check_head(head)
+    assert registry[owner]._routes == {}
+
+    # NOTE: Removed events that were never applied are just dropped
+    registry._pending = [install]
+    registry._buffer_log(as_log(install, removed=True))
+    assert registry._pending == []
@@ -0,0 +1,96 @@
+from ape.utils import ZERO_ADDRESS
+
+from purse import Accessory, Purse
+from purse.events import RouteUpdate
+from purse.reorg import BlockDeltas
+
+
+def test_block_deltas():
+    deltas = BlockDeltas(window=2)
+    deltas.record(1, b"\x01", "a")
+    deltas.record(2, b"\x02", "b")
+    deltas.record(2, b"\x02", "c")
+
+    assert deltas.conflicts(2, b"\x03")
+    assert deltas.conflicts(0, b"\x00")  # NOTE: Earlier than the newest block
+    assert not deltas.conflicts(1, b"\x01")
+    assert not deltas.conflicts(2, b"\x02")
+    assert not deltas.conflicts(3, b"\x03")
+
+    deltas.record(3, b"\x03", "d")
+    assert list(deltas.blocks) == [2, 3]
+    assert deltas.pruned
+
+    assert deltas.rollback(2) == ["d", "c", "b"]
+    assert deltas.blocks == {}
+
+    # NOTE: Unknown block hashes (e.g. from receipts) can't conflict
+    deltas.record(4, None, "e")
+    assert not deltas.conflicts(4, b"\x04")
+    assert not deltas.conflicts(4, None)
+
+
+def test_purse_reorg(chain, purse, owner, dummy, multicall):
+    purse.sync()
+    snapshot = chain.snapshot()
+
+    purse.add_accessories(dummy, sender=owner)
+    assert purse.accessories == {dummy}
+
+    # NOTE: Replace the block that installed `dummy` with one that installs `multicall`
+    chain.restore(snapshot)
+    Purse(owner).add_accessories(multicall, sender=owner)
+
+    assert purse._handle_reorg()
+    assert purse.accessories == {multicall}
+    assert not purse._handle_reorg()
+
+
+def test_late_logs_are_reapplied_in_order(owner, dummy):
+    purse = Purse(owner)
+    accessory = Accessory(dummy.address)
+    # NOTE: Any method ids will do, as routes are not called
+    a, b, c = (bytes([n]) * 4 for n in range(1, 4))
+    install_a = RouteUpdate(owner.address, a, ZERO_ADDRESS, dummy.address, 5, 0)
+    install_b = RouteUpdate(owner.address, b, ZERO_ADDRESS, dummy.address, 5, 1)
+    remove_a = RouteUpdate(owner.address, a, dummy.address, ZERO_ADDRESS, 5, 2)
+    install_c = RouteUpdate(owner.address, c, ZERO_ADDRESS, dummy.address, 6, 0)
+
+    for indexed in (purse, accessory):
+        # NOTE: Removal arrives before the install it undoes, and a log of a different
+        #       method arrives after a later block was applied (then gets redelivered)
+        for update in (remove_a, install_a, install_c, install_b, install_a):
+            indexed._apply_route_updates([update])
+
+    assert purse._routes == {b: dummy.address, c: dummy.address}
+    assert accessory._routes == {owner.address: {b, c}}
+    assert purse._last_applied == accessory._last_applied == (6, 0)
+
+
+def test_logs_are_applied_once_block_is_complete(
+    chain, owner, multicall, dummy, as_log
+):
+    purse = Purse(owner)
+    a, b = [m.method for m in multicall.methods + dummy.methods][:2]
+    block_1, block_2 = chain.blocks[1], chain.blocks[2]
+    install, replace, late = (
+        RouteUpdate(owner.address, a, ZERO_ADDRESS, dummy.address, 1, 0, block_1.hash),
+        RouteUpdate(
+            owner.address, a, dummy.address, multicall.address, 1, 1, block_1.hash
+        ),
+        RouteUpdate(owner.address, b, ZERO_ADDRESS, dummy.address, 1, 2, block_1.hash),
+    )
+
+    # NOTE: Logs of the same block may arrive out of order
+    purse._update_from_log(as_log(replace))
+    purse._update_from_log(as_log(install))
+    assert purse._routes == {}
+
+    purse._check_head(block_2)
+    assert purse._routes == {a: multicall.address}
+    assert purse._last_indexed == 1
+
+    # NOTE: Logs of a block that was already applied are still applied (once)
+    purse._update_from_log(as_log(late))
+    purse._update_from_log(as_log(late))
+    assert purse._routes == {a: multicall.address, b: dummy.address}
@@ -1,6 +1,10 @@
+import ape
 import pytest
+from eth_account.messages import encode_typed_data
+from eth_utils.crypto import keccak
 
 from purse import Purse
+from purse.sponsor import MIN_MESSAGES_PER_PROCESS
 
 
 @pytest.fixture()
@@ -8,40 +12,190 @@ def purse(singleton, owner, sponsor):
     return Purse.initialize(owner, sponsor, singleton=singleton)
 
 
-def test_sponsor_plain_eth_transfer(purse, dummy, owner):
-    # Generate random ETH amount > 0 (fuzz with hypothesis)
-    # Call sponsor with no data and value > 0
-    # Verify dummy received and processed ETH
-    pass
+@pytest.fixture()
+def relayer(accounts):
+    return accounts[2]
+
+
+def test_digest_matches_eip712(purse, chain):
+    signer = purse.sponsor_signer()
+    message = dict(
+        target=purse.address,
+        data=b"\x01\x02",
+        amount=1,
+        deadline=2,
+        nonce=3,
+    )
+    domain = dict(
+        name="Sponsor",
+        version="1",
+        chainId=chain.chain_id,
+        verifyingContract=purse.address,
+    )
+    types = dict(
+        Sponsor=[
+            dict(name="target", type="address"),
+            dict(name="data", type="bytes"),
+            dict(name="amount", type="uint256"),
+            dict(name="deadline", type="uint256"),
+            dict(name="nonce", type="uint256"),
+        ]
+    )
+    signable = encode_typed_data(domain, types, message)
+
+    assert signer.digest(**message) == keccak(
+        b"\x19\x01" + signable.header + signable.body
+    )
+
+
+@pytest.mark.parametrize("amount", [1, 10**18], ids=["1-wei", "1-ether"])
+def test_sponsor_plain_eth_transfer(purse, relayer, other, amount):
+    balance = other.balance
+    call = purse.sponsor_signer().sign(other, amount=amount)
+
+    relayer.transfer(purse.address, 0, data=call.calldata)
+
+    assert other.balance - balance == amount
+
+
+@pytest.mark.parametrize("amount", [0, 10**18], ids=["no-value", "1-ether"])
+def test_sponsor_eth_attached_to_call(purse, relayer, dummy, amount):
+    # NOTE: Dummy only records calls with at least 2048 bytes of calldata
+    data = bytes(range(256)) * 8
+    balance = dummy.contract.balance
+    call = purse.sponsor_signer().sign(dummy.address, data=data, amount=amount)
+
+    purse.sponsor(*call.args, sender=relayer)
+
+    assert dummy.contract.last_call() == data
+    assert dummy.contract.balance - balance == amount
+
+
+def test_sponsor_target_is_purse_self(purse, relayer):
+    balance = purse.balance
+    call = purse.sponsor_signer().sign(purse.address, amount="1 ether")
+
+    purse.sponsor(*call.args, sender=relayer)
+
+    assert purse.balance == balance
+    assert purse.sponsor_nonce() == call.nonce + 1
+
+
+def test_sponsor_many(purse, relayer, other):
+    balance = other.balance
+    calls = purse.sponsor_signer().sign_many([(other, b"", 1)] * 3)
+
+    assert [call.nonce for call in calls] == [0, 1, 2]
+    for call in calls:
+        purse.sponsor(*call.args, sender=relayer)
+
+    assert other.balance - balance == 3
+    assert purse.sponsor_nonce() == 3
+
+
+def test_sign_many_in_parallel(purse, other):
+    calls = [(other, bytes(range(32)), 0)] * (2 * MIN_MESSAGES_PER_PROCESS)
+
+    assert purse.sponsor_signer().sign_many(
+        calls, max_workers=2
+    ) == purse.sponsor_signer().sign_many(calls, max_workers=1)
+
+
+def test_sponsor_reverts_if_signature_expired(purse, relayer, other, chain):
+    call = purse.sponsor_signer().sign(
+        other, amount=1, deadline=chain.pending_timestamp - 1
+    )
+
+    with ape.reverts(message="Sponsor:!expired-signature"):
+        purse.sponsor(*call.args, sender=relayer)
+
+
+@pytest.mark.parametrize("offset", [-1, 1])
+def test_sponsor_reverts_if_nonce_used_is_incorrect(purse, relayer, other, offset):
+    # NOTE: Use up the first nonce, so that there is a previous one
+    purse.sponsor(*purse.sponsor_signer().sign(other).args, sender=relayer)
+    nonce = purse.sponsor_nonce()
+    call = purse.sponsor_signer(nonce=nonce + offset).sign(other, amount=1)
+
+    with ape.reverts(message="Sponsor:!unauthorized-signer"):
+        purse.sponsor(*call.args, sender=relayer)
+
+
+def test_sponsor_reverts_signer_is_unauthorized(purse, relayer, other):
+    call = purse.sponsor_signer(signer=other).sign(other, amount=1)
+
+    with ape.reverts(message="Sponsor:!unauthorized-signer"):
+        purse.sponsor(*call.args, sender=relayer)
+
+
+def test_batch_digest_matches_eip712(purse, chain):
+    signer = purse.sponsor_signer()
+    calls = [(purse.address, b"\x01\x02", 1), (purse.address, b"", 2)]
+    domain = dict(
+        name="Sponsor",
+        version="1",
+        chainId=chain.chain_id,
+        verifyingContract=purse.address,
+    )
+    types = dict(
+        SponsorBatch=[
+            dict(name="calls", type="Call[]"),
+            dict(name="deadline", type="uint256"),
+            dict(name="nonce", type="uint256"),
+        ],
+        Call=[
+            dict(name="target", type="address"),
+            dict(name="data", type="bytes"),
+            dict(name="amount", type="uint256"),
+        ],
+    )
+    message = dict(
+        calls=[dict(target=t, data=d, amount=a) for t, d, a in calls],
+        deadline=2,
+        nonce=3,
+    )
+    signable = encode_typed_data(domain, types, message)
+
+    assert signer.batch_digest(calls, 2, 3) == keccak(
+        b"\x19\x01" + signable.header + signable.body
+    )
+
+
+def test_sponsor_batch(purse, relayer, other):
+    balance = other.balance
+    batches = purse.sponsor_signer().sign_batches(
+        [(other, b"", amount) for amount in range(1, 6)], batch_size=3
+    )
+
+    assert [len(batch.calls) for batch in batches] == [3, 2]
+    assert [batch.nonce for batch in batches] == [0, 1]
+
+    purse.sponsor_batch(*batches[0].args, sender=relayer)
+    relayer.transfer(purse.address, 0, data=batches[1].calldata)
 
+    assert other.balance - balance == sum(range(1, 6))
+    assert purse.sponsor_nonce() == 2
 
-def test_sponsor_eth_attached_to_call(purse, dummy, owner):
-    # Fuzz random bytes data with hypothesis and random eth value
-    # Sponsor a call with calldata and value
-    # Check dummy recorded the data hash
-    pass
 
+def test_sponsor_batch_reverts_if_signature_expired(purse, relayer, other, chain):
+    batch = purse.sponsor_signer().sign_batch(
+        [(other, b"", 1)], deadline=chain.pending_timestamp - 1
+    )
 
-def test_sponsor_target_is_purse_self(purse, owner):
-    # Send a call to self with ETH, triggering __default__ (reentrant)
-    # Expect successful processing (no revert, maybe check call depth if possible)
-    pass
+    with ape.reverts(message="Sponsor:!expired-signature"):
+        purse.sponsor_batch(*batch.args, sender=relayer)
 
 
-def test_sponsor_reverts_if_signature_expired(purse, owner):
-    # Construct an expired signature using a timestamp in the past
-    # Use ape reverts to check the Sponsor:!expired-signature error is bubbled up
-    pass
+def test_sponsor_batch_reverts_if_calls_changed(purse, relayer, other):
+    batch = purse.sponsor_signer().sign_batch([(other, b"", 1)])
+    batch = batch._replace(calls=[(other.address, b"", 2)])
 
+    with ape.reverts(message="Sponsor:!unauthorized-signer"):
+        purse.sponsor_batch(*batch.args, sender=relayer)
 
-def test_sponsor_reverts_if_nonce_used_is_incorrect(purse, owner):
-    # Fetch the correct nonce
-    # Loop and use wrong nonce (off-by-one)
-    # Use ape reverts, check Sponsor:!unauthorized-signer erro
-    pass
 
+def test_sponsor_batch_reverts_signer_is_unauthorized(purse, relayer, other):
+    batch = purse.sponsor_signer(signer=other).sign_batch([(other, b"", 1)])
 
-def test_sponsor_reverts_signer_is_unauthorized(purse, other):
-    # Mallory signs instead of the owner
-    # Use ape reverts, check Sponsor:!unauthorized-signer erro
-    pass
+    with ape.reverts(message="Sponsor:!unauthorized-signer"):
+        purse.sponsor_batch(*batch.args, sender=relayer)
@@ -1,5 +1,23 @@
+import pytest
 from ape import convert, reverts
+from ape.exceptions import APINotImplementedError
 from ape.utils import ZERO_ADDRESS
+from ape_ethereum import multicall
+from eth_utils import to_hex
+from eth_utils.crypto import keccak
+
+from purse import Accessory, Purse
+from purse.accessory import AccessoryMethod
+from purse.delegation import get_delegations
+from purse.events import (
+    RouteUpdate,
+    decode_route_updates,
+    get_route_update_columns,
+    route_update_columns,
+)
+from purse.main import _composite_contract_type
+from purse.package import DEPLOYMENTS
+from purse.planner import MAX_UPDATES
 
 
 def test_init(singleton, purse, owner):
@@ -56,3 +74,187 @@ def test_add_rm_accessory(purse, dummy):
 def test_cant_call_arbitrary(purse):
     with reverts(message="Purse:!no-accessory-found"):
         purse.contract(data="0xa1b2c3d", sender=purse.wallet)
+
+
+@pytest.mark.parametrize("from_storage", [False, True])
+@pytest.mark.parametrize("use_multicall", [False, True])
+def test_accessories_for(purse, dummy, use_multicall, from_storage):
+    if use_multicall:
+        try:
+            multicall.Call.inject()
+        except APINotImplementedError:
+            pytest.skip("Provider cannot inject Multicall3")
+
+    selectors = [m.method for m in dummy.methods]
+    # NOTE: Also read a method that is never routed, so there is more than one selector
+    unused = bytes.fromhex("12345678")
+    assert purse.accessories_for([*selectors, unused], from_storage=from_storage) == {
+        s: ZERO_ADDRESS for s in [*selectors, unused]
+    }
+
+    purse.add_accessories(dummy, sender=purse.wallet)
+    assert purse.accessories_for([*selectors, unused], from_storage=from_storage) == {
+        **{s: dummy.address for s in selectors},
+        unused: ZERO_ADDRESS,
+    }
+    assert purse.has_accessory(dummy)
+
+
+def test_contract_type_shared_by_accessory_set(owner, dummy):
+    a, b = Purse(owner, dummy), Purse(owner, dummy)
+    assert a.contract.contract_type is b.contract.contract_type
+    assert Purse(owner).contract.contract_type is not a.contract.contract_type
+
+    # NOTE: Not shared w/ other chains, where the same addresses may be other contracts
+    chain_id = a.chain_manager.chain_id
+    assert _composite_contract_type(
+        chain_id + 1, frozenset([dummy])
+    ) is not _composite_contract_type(chain_id, frozenset([dummy]))
+
+
+def test_accessory_handlers_indexed(purse, dummy):
+    with pytest.raises(AttributeError):
+        purse.last_call
+
+    purse.add_accessories(dummy, sender=purse.wallet)
+    abi_length = len(purse.contract.contract_type.abi)
+
+    assert purse.last_call is purse.last_call
+    assert purse.last_call() == b""
+    assert len(purse.contract.contract_type.abi) == abi_length
+
+
+def test_sync(purse, owner, dummy, tmp_path):
+    purse.add_accessories(dummy, sender=purse.wallet)
+    checkpoint = tmp_path / "purse.json"
+
+    indexer = Purse(owner)
+    assert indexer.sync(checkpoint=checkpoint) > 0
+    assert dummy in indexer.accessories
+    assert checkpoint.is_file()
+
+    # NOTE: Resumes from checkpoint w/o querying previous logs
+    restarted = Purse(owner)
+    assert restarted.sync(checkpoint=checkpoint) == 0
+    assert dummy in restarted.accessories
+
+    purse.remove_accessories(dummy, sender=purse.wallet)
+    assert restarted.sync() == len(dummy.methods)
+    assert dummy not in restarted.accessories
+
+
+def test_decode_route_updates(purse, dummy):
+    receipt = purse.add_accessories(dummy, sender=purse.wallet)
+    updates = decode_route_updates(receipt.logs)
+
+    assert updates == [RouteUpdate.from_log(log) for log in receipt.events]
+
+    columns = route_update_columns(receipt.logs)
+    assert [bytes(method) for method in columns["method"]] == [
+        update.method for update in updates
+    ]
+    assert {bytes(address) for address in columns["new_accessory"]} == {
+        bytes.fromhex(dummy.address[2:])
+    }
+    assert list(columns["block_number"]) == [receipt.block_number] * len(updates)
+
+    # NOTE: As returned by `eth_getLogs`
+    raw_logs = [
+        dict(
+            address=log["address"],
+            topics=[to_hex(topic) for topic in log["topics"]],
+            blockNumber=hex(log["blockNumber"]),
+            logIndex=hex(log["logIndex"]),
+        )
+        for log in receipt.logs
+    ]
+    assert decode_route_updates(raw_logs) == [
+        update._replace(block_hash=None) for update in updates
+    ]
+    for name, values in route_update_columns(raw_logs).items():
+        assert (values == columns[name]).all()
+
+    # NOTE: Backfilled in one range, as there is a single block
+    (backfilled,) = get_route_update_columns(
+        receipt.block_number, receipt.block_number, addresses=[purse.address]
+    )
+    for name, values in backfilled.items():
+        assert (values == columns[name]).all()
+
+
+def test_accessory_sync(chain, purse, dummy, tmp_path):
+    if chain.provider.name == "test":
+        pytest.skip("EthereumTester can't query logs without an address filter")
+
+    indexer = Accessory(dummy.address)
+    checkpoint = tmp_path / "accessory.json"
+
+    purse.add_accessories(dummy, sender=purse.wallet)
+    indexer.sync(checkpoint=checkpoint)
+    assert purse.address in indexer.purses
+
+    purse.remove_accessories(dummy, sender=purse.wallet)
+    assert indexer.sync() == len(dummy.methods)
+    assert purse.address not in indexer.purses
+
+    restarted = Accessory(dummy.address)
+    assert restarted.sync(checkpoint=checkpoint) == 0
+    assert purse.address not in restarted.purses
+
+
+def test_get_delegations(singleton, accounts, other):
+    account = accounts[3]
+    account.set_delegate(singleton)
+    delegations = get_delegations([account.address, other.address])
+
+    assert delegations[account.address].delegate == singleton.address
+    # NOTE: Local singleton is deployed from a known version of Purse (so never `None`)
+    assert (
+        delegations[account.address].purse == DEPLOYMENTS[keccak(singleton.code).hex()]
+    )
+    assert delegations[other.address].delegate is None
+    assert delegations[other.address].purse is None
+
+
+def test_plan_updates(purse, dummy, multicall):
+    assert purse.plan(dummy) == dummy.methods
+    (gas,) = purse.estimate_updates(purse.plan(dummy, multicall))
+    assert gas > 0
+
+    purse.add_accessories(dummy)
+    # NOTE: Methods that are already routed are skipped
+    assert purse.plan(dummy, multicall) == multicall.methods
+    assert purse.add_accessories(dummy) is None
+
+    tx = purse.add_accessories(dummy, multicall)
+    assert len(tx.events) == len(multicall.methods)
+    assert purse.plan(remove=[dummy]) == [
+        AccessoryMethod(m.method, ZERO_ADDRESS) for m in dummy.methods
+    ]
+
+    purse.remove_accessories(dummy, multicall)
+    assert purse.remove_accessories(dummy) is None
+    assert len(purse.accessories) == 0
+
+
+def test_update_many_methods(compilers, singleton, accounts):
+    SRC = "# pragma version 0.4.1\n" + "".join(
+        f"\n@external\ndef method_{idx}():\n    pass\n"
+        for idx in range(MAX_UPDATES + 1)
+    )
+    container = compilers.compile_source("vyper", SRC, contractName="ManyMethods")
+    account = accounts[2]
+    many = Accessory(container.deploy(sender=account))
+
+    # NOTE: Updates that don't fit in one transaction are split into batches
+    purse = Purse.initialize(account, many, singleton=singleton)
+    assert len(purse.plan(many)) == 0
+    assert purse.accessories == {many}
+
+    tx = purse.remove_accessories(many)
+    assert len(tx.events) == 1
+    assert len(purse.accessories) == 0
+
+    tx = purse.add_accessories(many)
+    assert len(tx.events) == 1
+    assert purse.accessories == {many}